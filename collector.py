@@ -25,6 +25,11 @@ from typing import Any, TextIO
 
 from tqdm import tqdm
 
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
 from quran_api import QuranAPIClient
 from tafsir_fetcher import TafsirFetcher
 
@@ -35,6 +40,14 @@ logger = logging.getLogger(__name__)
 FOOTNOTE_PATTERN = re.compile(r'<sup\s+foot_note=(\d+)>(\d+)</sup>')
 
 
+def _dumps_line(verse: dict[str, Any]) -> str:
+    """Serialize a verse as one JSONL line (UTF-8 text, not ASCII escapes)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        return orjson.dumps(verse, option=option).decode("utf-8")
+    return json.dumps(verse, ensure_ascii=False) + "\n"
+
+
 @dataclass
 class CollectorStats:
     """Statistics for the collection process."""
@@ -476,9 +489,11 @@ class QuranDataCollector:
         
         logger.debug(f"Flushing {len(self._verse_buffer)} verses to file")
         
-        for verse in self._verse_buffer:
-            json_line = json.dumps(verse, ensure_ascii=False)
-            self._output_handle.write(json_line + "\n")
+        # One write per batch; orjson (when installed) encodes tafsir-sized
+        # strings several times faster than json.dumps
+        self._output_handle.write("".join(
+            _dumps_line(verse) for verse in self._verse_buffer
+        ))
         
         self._output_handle.flush()
         self._verse_buffer.clear()
@@ -521,32 +536,36 @@ class QuranDataCollector:
         if self._shutdown_requested:
             return False
         
-        # Fetch tafsirs if enabled
-        tafsirs_map: dict[str, dict[str, str | None]] = {}
+        # Fetch tafsirs if enabled; the fetcher streams each verse's tafsirs
+        # to the sink, which formats and buffers it (no chapter-wide map)
         if self.tafsir_fetcher and self.tafsirs:
-            verse_keys = [v.get("verse_key") for v in verses]
-            tafsirs_map = self.tafsir_fetcher.fetch_for_verses(
-                verse_keys,
+            verses_by_key = {v.get("verse_key", ""): v for v in verses}
+            
+            def write_verse(verse_key: str, tafsirs: dict[str, str | None]) -> None:
+                if not self._shutdown_requested:
+                    self._add_to_buffer(self._format_verse(
+                        verse=verses_by_key[verse_key],
+                        chapter=chapter,
+                        tafsirs=tafsirs,
+                    ))
+            
+            self.tafsir_fetcher.fetch_for_verses_streaming(
+                list(verses_by_key),
+                write_verse,
                 position=pbar_position,
             )
-            self.stats.tafsirs_fetched += len(verse_keys) * len(self.tafsirs)
+            self.stats.tafsirs_fetched += len(verses_by_key) * len(self.tafsirs)
+        else:
+            # Format and buffer verses
+            for verse in verses:
+                if self._shutdown_requested:
+                    return False
+                
+                self._add_to_buffer(self._format_verse(verse=verse, chapter=chapter))
         
         if self._shutdown_requested:
             return False
         
-        # Format and buffer verses
-        for verse in verses:
-            if self._shutdown_requested:
-                return False
-            
-            verse_key = verse.get("verse_key", "")
-            formatted = self._format_verse(
-                verse=verse,
-                chapter=chapter,
-                tafsirs=tafsirs_map.get(verse_key),
-            )
-            self._add_to_buffer(formatted)
-        
         self.stats.chapters_processed += 1
         return True
     
@@ -6,10 +6,13 @@ A thread-safe HTTP client for the Quran Foundation API with:
 - Automatic retry logic with exponential backoff
 - Circuit breaker pattern for rate limit protection
 - Configurable delays between requests
+- Optional asyncio/aiohttp request path sharing the same rate limit
+  and circuit breaker (used for high-concurrency tafsir fetching)
 
 Author: Tazkiyah Project
 """
 
+import asyncio
 import logging
 import threading
 import time
@@ -20,10 +23,25 @@ import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util import Retry
 
+try:
+    import aiohttp
+except ImportError:  # Optional: async path falls back to threads when missing
+    aiohttp = None
+
 # Configure module logger
 logger = logging.getLogger(__name__)
 
 
+class _CappedRetry(Retry):
+    """urllib3 Retry whose Retry-After wait is capped at QuranAPIClient.MAX_RETRY_AFTER."""
+    
+    def get_retry_after(self, response) -> float | None:
+        retry_after = super().get_retry_after(response)
+        if retry_after is None:
+            return None
+        return max(0.0, min(retry_after, QuranAPIClient.MAX_RETRY_AFTER))
+
+
 @dataclass
 class CircuitBreakerState:
     """Thread-safe circuit breaker state management."""
@@ -130,6 +148,9 @@ class QuranAPIClient:
     
     BASE_URL = "https://api.quran.com"
     API_VERSION = "v4"
+    POOL_SIZE = 10  # TafsirFetcher.MAX_CONCURRENCY
+    RETRY_STATUSES = (500, 502, 503, 504)  # transient; 429 goes to the circuit breaker
+    MAX_RETRY_AFTER = 30.0  # seconds; cap on a 503's Retry-After (sync and async paths)
     
     def __init__(
         self,
@@ -148,7 +169,7 @@ class QuranAPIClient:
             base_url: API base URL (default: pre-production endpoint)
             rate_limit_delay: Minimum seconds between requests (default: 0.3)
             timeout: (connect_timeout, read_timeout) in seconds
-            max_retries: Maximum retry attempts for 5xx errors
+            max_retries: Maximum retry attempts for 5xx and connection errors
             concurrency: Initial concurrency level for parallel operations
             circuit_breaker_threshold: Consecutive 429s before tripping
             circuit_breaker_pause: Seconds to pause when circuit breaker trips
@@ -156,6 +177,7 @@ class QuranAPIClient:
         self.base_url = (base_url or self.BASE_URL).rstrip("/")
         self.rate_limit_delay = rate_limit_delay
         self.timeout = timeout
+        self.max_retries = max_retries
         
         # Thread-safe state
         self._last_request_time: float = 0.0
@@ -169,31 +191,39 @@ class QuranAPIClient:
             original_concurrency=concurrency,
         )
         
-        # Configure session with retry logic
-        self._session = self._create_session(max_retries)
+        # Configure session with retry logic; pool holds a keep-alive
+        # connection for every thread the tafsir fetcher may run
+        self._session = self._create_session(
+            max_retries, pool_size=max(concurrency, self.POOL_SIZE)
+        )
         
         logger.info(
             f"QuranAPIClient initialized: base_url={self.base_url}, "
             f"delay={rate_limit_delay}s, concurrency={concurrency}"
         )
     
-    def _create_session(self, max_retries: int) -> requests.Session:
-        """Create a requests session with retry configuration."""
+    def _create_session(self, max_retries: int, pool_size: int) -> requests.Session:
+        """Create a pooled keep-alive requests session with retry configuration."""
         session = requests.Session()
         
-        # Configure retry strategy for 5xx errors (not 429 - handled by circuit breaker)
-        retry_strategy = Retry(
+        # Configure retry strategy for 5xx errors (not 429 - handled by circuit breaker).
+        # urllib3 retries on the pooled connection and honours Retry-After on 503
+        # (capped at MAX_RETRY_AFTER, so a server can't stall the fetcher).
+        retry_strategy = _CappedRetry(
             total=max_retries,
             backoff_factor=0.5,
-            status_forcelist=[502, 503, 504],
+            status_forcelist=self.RETRY_STATUSES,
             allowed_methods=["GET"],
             raise_on_status=False,  # Don't raise, let us handle
         )
         
+        # pool_block=False: a burst beyond pool_size opens a temporary
+        # connection instead of stalling the thread
         adapter = HTTPAdapter(
             max_retries=retry_strategy,
-            pool_connections=10,
-            pool_maxsize=10,
+            pool_connections=pool_size,
+            pool_maxsize=pool_size,
+            pool_block=False,
         )
         
         session.mount("https://", adapter)
@@ -202,6 +232,7 @@ class QuranAPIClient:
         # Set default headers
         session.headers.update({
             "Accept": "application/json",
+            "Connection": "keep-alive",
             "User-Agent": "Tazkiyah-QuranCollector/1.0",
         })
         
@@ -432,6 +463,60 @@ class QuranAPIClient:
                 return None
             raise
     
+    def get_tafsir_by_chapter(
+        self,
+        tafsir_id: int,
+        chapter_number: int,
+        per_page: int = 50,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Get tafsirs for every verse of a chapter, handling pagination.
+        
+        One request per page instead of one per verse. Verses the response
+        leaves out (or returns without text) are absent from the result, so
+        callers can fall back to get_tafsir_by_ayah for them.
+        
+        Args:
+            tafsir_id: Tafsir resource ID
+            chapter_number: Chapter number (1-114)
+            per_page: Results per page (max 50)
+            
+        Returns:
+            Dictionary mapping verse_key to tafsir dictionary
+        """
+        endpoint = f"/api/{self.API_VERSION}/tafsirs/{tafsir_id}/by_chapter/{chapter_number}"
+        tafsirs: dict[str, dict[str, Any]] = {}
+        page: int | None = 1
+        
+        try:
+            while page is not None:
+                response = self._request(endpoint, params=self._tafsir_page_params(page, per_page))
+                page = self._collect_tafsir_page(response, tafsirs)
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                logger.debug(f"Tafsir not found: {tafsir_id} for chapter {chapter_number}")
+                return tafsirs
+            raise
+        
+        return tafsirs
+    
+    @staticmethod
+    def _tafsir_page_params(page: int, per_page: int) -> dict[str, Any]:
+        """Query parameters for one page of a by_chapter tafsir request."""
+        return {"page": page, "per_page": min(per_page, 50), "fields": "verse_key"}
+    
+    @staticmethod
+    def _collect_tafsir_page(
+        response: dict[str, Any],
+        tafsirs: dict[str, dict[str, Any]],
+    ) -> int | None:
+        """Add one page of by_chapter tafsirs to `tafsirs`; return the next page."""
+        for tafsir in response.get("tafsirs", []):
+            verse_key = tafsir.get("verse_key")
+            if verse_key and tafsir.get("text"):
+                tafsirs[verse_key] = tafsir
+        return response.get("pagination", {}).get("next_page")
+    
     def get_translations_list(self, language: str | None = None) -> list[dict[str, Any]]:
         """
         Get list of available translations.
@@ -486,6 +571,175 @@ class QuranAPIClient:
                 return None
             raise
     
+    # =========================================================================
+    # Async (aiohttp) request path
+    # =========================================================================
+    
+    def create_async_session(self, concurrency: int) -> "aiohttp.ClientSession":
+        """
+        Create an aiohttp session for the async request methods.
+        
+        Must be called from inside a running event loop. The connector keeps
+        up to `concurrency` keep-alive connections open to the API host.
+        
+        Args:
+            concurrency: Maximum simultaneous connections
+            
+        Returns:
+            aiohttp.ClientSession (caller closes it)
+        """
+        if aiohttp is None:
+            raise ImportError("aiohttp is required for async requests: pip install aiohttp")
+        
+        connect_timeout, read_timeout = self.timeout
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=concurrency, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(sock_connect=connect_timeout, sock_read=read_timeout),
+            headers=dict(self._session.headers),
+        )
+    
+    async def _enforce_rate_limit_async(self) -> None:
+        """Reserve the next request slot, then sleep without holding the lock."""
+        with self._request_lock:
+            now = time.time()
+            wait = max(0.0, self._last_request_time + self.rate_limit_delay - now)
+            self._last_request_time = now + wait
+        if wait > 0:
+            await asyncio.sleep(wait)
+    
+    async def _wait_for_circuit_breaker_async(self) -> None:
+        """Wait (without blocking the event loop) if circuit breaker is open."""
+        while not self.circuit_breaker.should_allow_request():
+            remaining = (
+                self.circuit_breaker.pause_duration - 
+                (time.time() - self.circuit_breaker.last_failure_time)
+            )
+            if remaining > 0:
+                logger.info(f"Circuit breaker open. Waiting {remaining:.1f}s...")
+                await asyncio.sleep(min(remaining, 5.0))  # Check every 5s
+    
+    def _retry_delay(self, response: "aiohttp.ClientResponse", attempt: int) -> float:
+        """Backoff before retrying a 5xx; a 503's Retry-After (seconds) wins, capped."""
+        if response.status == 503:
+            try:
+                retry_after = float(response.headers["Retry-After"])
+                return max(0.0, min(retry_after, self.MAX_RETRY_AFTER))
+            except (KeyError, ValueError):
+                pass  # Absent or an HTTP-date: fall back to exponential backoff
+        return 0.5 * (2 ** attempt)
+    
+    async def _request_async(
+        self,
+        session: "aiohttp.ClientSession",
+        endpoint: str,
+        params: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Async equivalent of _request: same rate limit, circuit breaker,
+        429 backoff and RETRY_STATUSES retries.
+        
+        Raises:
+            aiohttp.ClientResponseError: On non-recoverable HTTP errors
+            aiohttp.ClientError: On network errors
+        """
+        url = f"{self.base_url}{endpoint}"
+        attempt = 0
+        
+        while True:
+            await self._wait_for_circuit_breaker_async()
+            await self._enforce_rate_limit_async()
+            
+            try:
+                async with session.get(url, params=params) as response:
+                    # Handle rate limiting (429)
+                    if response.status == 429:
+                        should_trip = self.circuit_breaker.record_failure()
+                        if should_trip:
+                            self.circuit_breaker.reduce_concurrency()
+                            await asyncio.sleep(self.circuit_breaker.pause_duration)
+                        else:
+                            # Exponential backoff for individual 429
+                            backoff = 2 ** self.circuit_breaker.consecutive_failures
+                            logger.warning(f"Rate limited (429). Backing off {backoff}s...")
+                            await asyncio.sleep(backoff)
+                        continue
+                    
+                    # Retry transient 5xx (mirrors the session's urllib3 Retry)
+                    if response.status in self.RETRY_STATUSES and attempt < self.max_retries:
+                        await asyncio.sleep(self._retry_delay(response, attempt))
+                        attempt += 1
+                        continue
+                    
+                    # Success - reset circuit breaker
+                    if response.ok:
+                        self.circuit_breaker.record_success()
+                    
+                    response.raise_for_status()
+                    return await response.json(content_type=None)
+                    
+            except asyncio.TimeoutError:
+                logger.error(f"Request timeout: {url}")
+                raise
+            except aiohttp.ClientResponseError:
+                raise
+            except aiohttp.ClientError as e:
+                logger.error(f"Request failed: {url} - {e}")
+                raise
+    
+    async def get_tafsir_by_ayah_async(
+        self,
+        session: "aiohttp.ClientSession",
+        tafsir_id: int,
+        verse_key: str,
+    ) -> dict[str, Any] | None:
+        """
+        Async get_tafsir_by_ayah using a session from create_async_session().
+        
+        Returns:
+            Tafsir dictionary or None if not found
+        """
+        endpoint = f"/api/{self.API_VERSION}/tafsirs/{tafsir_id}/by_ayah/{verse_key}"
+        
+        try:
+            response = await self._request_async(session, endpoint)
+            return response.get("tafsir")
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                logger.debug(f"Tafsir not found: {tafsir_id} for {verse_key}")
+                return None
+            raise
+    
+    async def get_tafsir_by_chapter_async(
+        self,
+        session: "aiohttp.ClientSession",
+        tafsir_id: int,
+        chapter_number: int,
+        per_page: int = 50,
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Async get_tafsir_by_chapter using a session from create_async_session().
+        
+        Returns:
+            Dictionary mapping verse_key to tafsir dictionary
+        """
+        endpoint = f"/api/{self.API_VERSION}/tafsirs/{tafsir_id}/by_chapter/{chapter_number}"
+        tafsirs: dict[str, dict[str, Any]] = {}
+        page: int | None = 1
+        
+        try:
+            while page is not None:
+                response = await self._request_async(
+                    session, endpoint, params=self._tafsir_page_params(page, per_page)
+                )
+                page = self._collect_tafsir_page(response, tafsirs)
+        except aiohttp.ClientResponseError as e:
+            if e.status == 404:
+                logger.debug(f"Tafsir not found: {tafsir_id} for chapter {chapter_number}")
+                return tafsirs
+            raise
+        
+        return tafsirs
+    
     def get_concurrency(self) -> int:
         """Get current concurrency level (may be reduced by circuit breaker)."""
         return self.circuit_breaker.get_concurrency()
@@ -12,7 +12,10 @@ Usage:
 import logging
 import sys
 import time
+from collections import deque
 from datetime import datetime
+from itertools import islice
+from typing import Optional
 
 import gradio as gr
 
@@ -32,26 +35,31 @@ logger = logging.getLogger(__name__)
 # ============================================================================
 # Global State
 # ============================================================================
-# Debug log buffer for UI display
-debug_logs: list[str] = []
+# Debug log buffer for UI display (keeps last 500 entries for detailed pipeline logs)
+debug_logs: deque[str] = deque(maxlen=500)
+# Rendered text of the last 200 lines, rebuilt only after new log entries
+_debug_text_cache: Optional[str] = None
 
 
 def log_debug(message: str):
     """Add timestamped message to debug log."""
+    global _debug_text_cache
     timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
     # Split multi-line messages for better formatting
     for line in message.split("\n"):
         entry = f"[{timestamp}] {line}"
         debug_logs.append(entry)
+    _debug_text_cache = None
     logger.debug(message)
-    # Keep last 500 entries for detailed pipeline logs
-    while len(debug_logs) > 500:
-        debug_logs.pop(0)
 
 
 def get_debug_log_text() -> str:
     """Get debug logs as text."""
-    return "\n".join(debug_logs[-200:])  # Show last 200 lines
+    global _debug_text_cache
+    if _debug_text_cache is None:
+        # Show last 200 lines
+        _debug_text_cache = "\n".join(islice(debug_logs, max(0, len(debug_logs) - 200), None))
+    return _debug_text_cache
 
 
 # ============================================================================
@@ -127,8 +135,11 @@ def bot_response(history: list[dict]) -> tuple[list[dict], str]:
         })
         return history, get_debug_log_text()
     
-    # Check for indexed documents
+    # Check for indexed documents (count is cached; re-read only while the index looks empty,
+    # since indexing may have happened in another process)
     stats = rag.get_collection_stats()
+    if stats["count"] == 0:
+        stats = rag.get_collection_stats(refresh=True)
     if stats["count"] == 0:
         log_debug("ERROR: No documents indexed")
         history.append({
@@ -190,8 +201,9 @@ def bot_response(history: list[dict]) -> tuple[list[dict], str]:
 
 def clear_chat() -> tuple[list[dict], str]:
     """Clear chat history and debug logs."""
-    global debug_logs
-    debug_logs = []
+    global _debug_text_cache
+    debug_logs.clear()
+    _debug_text_cache = None
     log_debug("Chat and logs cleared")
     return [], get_debug_log_text()
 
@@ -27,6 +27,11 @@ EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text-v2-moe")
 EMBED_QUERY_PREFIX = os.getenv("EMBED_QUERY_PREFIX", "search_query: ")
 EMBED_DOCUMENT_PREFIX = os.getenv("EMBED_DOCUMENT_PREFIX", "search_document: ")
 
+# Embedding dimensions to keep (Matryoshka truncation, e.g. 256 for nomic models)
+# Smaller vectors = less memory/disk per document, slight recall trade-off
+# Set to 0 to keep the model's full dimension. Changing this requires re-indexing.
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "0"))
+
 # LLM Model (via Ollama)
 # Options for RTX 3080 10GB:
 #   - "qwen3:8b"        (4.9GB) - Best reasoning, recommended
@@ -52,6 +57,16 @@ CHROMA_PERSIST_DIR = Path(os.getenv(
 # Collection name in ChromaDB
 COLLECTION_NAME = os.getenv("COLLECTION_NAME", "quran_verses")
 
+# HNSW index settings (applied when the collection is first created)
+# Changing these requires re-indexing: python -m rag.index_chunks --clear <chunks.jsonl>
+# - space: "cosine" suits normalized nomic embeddings (distance = 1 - cosine similarity)
+# - construction_ef / M: graph quality at build time (higher = better recall, slower indexing)
+# - search_ef: candidates explored per query (lower = faster, keep well above TOP_K)
+HNSW_SPACE = os.getenv("HNSW_SPACE", "cosine")
+HNSW_CONSTRUCTION_EF = int(os.getenv("HNSW_CONSTRUCTION_EF", "200"))
+HNSW_SEARCH_EF = int(os.getenv("HNSW_SEARCH_EF", "40"))
+HNSW_M = int(os.getenv("HNSW_M", "32"))
+
 # =============================================================================
 # 🔍 RETRIEVAL CONFIGURATION (MOST IMPORTANT FOR TUNING)
 # =============================================================================
@@ -70,11 +85,29 @@ SEARCH_TYPE = os.getenv("SEARCH_TYPE", "similarity")
 # lambda_mult: 0 = max diversity, 1 = max relevance
 MMR_LAMBDA = float(os.getenv("MMR_LAMBDA", "0.5"))
 
+# Prefilter by surah when the question names one (e.g. "surah 2:255", "surah 18")
+# Chroma prunes by metadata before vector scoring; falls back to unfiltered
+# search if the referenced surah has no indexed documents. Opt-in: a filtered
+# search only sees the named surah
+QUERY_PREFILTER = os.getenv("QUERY_PREFILTER", "false").lower() == "true"
+
 # Minimum similarity score threshold (0.0 to 1.0)
 # Documents below this score will be filtered out
 # Set to 0.0 to disable filtering
 MIN_RELEVANCE_SCORE = float(os.getenv("MIN_RELEVANCE_SCORE", "0.0"))
 
+# Cross-encoder reranking (requires: pip install sentence-transformers)
+# Retrieves RERANK_FETCH_K candidates, then keeps the TOP_K the reranker scores highest
+# Better precision at the same context size, at the cost of one reranker pass per query
+USE_RERANKER = os.getenv("USE_RERANKER", "false").lower() == "true"
+RERANKER_MODEL = os.getenv("RERANKER_MODEL", "BAAI/bge-reranker-base")
+RERANK_FETCH_K = int(os.getenv("RERANK_FETCH_K", "20"))
+
+# Maximum characters of retrieved text sent to the LLM
+# Best-ranked chunks are packed first; the last one is cut at a sentence boundary
+# Keeps the prompt inside LLM_NUM_CTX and bounds prefill time. Set to 0 to disable.
+MAX_CONTEXT_CHARS = int(os.getenv("MAX_CONTEXT_CHARS", "6000"))
+
 # =============================================================================
 # 💬 LLM GENERATION CONFIGURATION
 # =============================================================================
@@ -84,8 +117,17 @@ MIN_RELEVANCE_SCORE = float(os.getenv("MIN_RELEVANCE_SCORE", "0.0"))
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.3"))
 
 # Maximum tokens in response
-# Higher = longer answers but slower
-LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+# Higher = longer answers but slower (the model usually stops well before this)
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "512"))
+
+# Context window (prompt + answer) and prompt-processing batch size
+# num_ctx must fit TOP_K chunks + answer; Ollama's default 2048 truncates long contexts
+# Larger num_batch = faster prefill (more VRAM)
+LLM_NUM_CTX = int(os.getenv("LLM_NUM_CTX", "4096"))
+LLM_NUM_BATCH = int(os.getenv("LLM_NUM_BATCH", "512"))
+
+# Stop sequences: end generation if the model starts inventing a new question/section
+LLM_STOP = ["\nQuestion:", "\n\n---"]
 
 # Top-p (nucleus sampling): 0.1-1.0
 # Lower = more focused, higher = more variety
@@ -8,15 +8,22 @@ Modern LangChain implementation based on latest documentation:
 - langchain-core: Prompts, documents, runnables
 """
 import logging
+import math
+import re
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Union
 from uuid import uuid4
 
+import httpx
+import numpy as np
 from langchain_ollama import OllamaEmbeddings, OllamaLLM
 from langchain_chroma import Chroma
+from langchain_chroma.vectorstores import maximal_marginal_relevance
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_core.output_parsers import StrOutputParser
+from langchain_core.runnables import Runnable
 
 from rag import config
 
@@ -27,6 +34,101 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Flattens newlines in debug snippets with a single C-level pass
+_NL_TRANS = str.maketrans({"\n": " "})
+
+# Surah references in a question: "surah 2:255", "verse 2:255", "Q 2:255", "surah 18",
+# "chapter 36". A bare "N:M" needs a keyword so times/ratios ("10:30") never match;
+# only surahs 1-114 are accepted
+_SURAH_NUMBER = r"(11[0-4]|10\d|[1-9]\d?)"
+_SURAH_REF_PATTERN = re.compile(
+    rf"\b(?:surah|sura|chapter|ayah|ayat|aya|verses?|quran|q)\.?\s*{_SURAH_NUMBER}:\d{{1,3}}\b"
+    rf"|\b(?:surah|sura|chapter)\s+{_SURAH_NUMBER}\b",
+    re.IGNORECASE,
+)
+
+# Passed through langchain-ollama to the underlying httpx client so every
+# embed/generate call reuses a warm keep-alive connection to Ollama
+_OLLAMA_CLIENT_KWARGS = {
+    "timeout": config.REQUEST_TIMEOUT,
+    "limits": httpx.Limits(
+        max_connections=max(config.MAX_CONCURRENT_REQUESTS, 8),
+        max_keepalive_connections=max(config.MAX_CONCURRENT_REQUESTS, 8),
+        keepalive_expiry=300,
+    ),
+}
+
+
+_SENTENCE_SPLIT_PATTERN = re.compile(r"(?<=[.!?])\s")
+
+
+def _truncate_to_sentence(text: str, limit: int) -> str:
+    """Cut text to at most `limit` chars, preferring a sentence boundary."""
+    if len(text) <= limit:
+        return text
+    kept = ""
+    for sentence in _SENTENCE_SPLIT_PATTERN.split(text):
+        candidate = f"{kept} {sentence}" if kept else sentence
+        if len(candidate) > limit:
+            break
+        kept = candidate
+    return kept or text[:limit]
+
+
+def build_context(
+    docs: list[Document],
+    max_chars: int = config.MAX_CONTEXT_CHARS,
+    separator: str = "\n\n",
+) -> tuple[str, int]:
+    """
+    Greedily pack documents (best-ranked first) into a context string.
+    
+    Returns:
+        (context, number of documents included, counting a truncated last one)
+    """
+    if max_chars <= 0:
+        return separator.join(doc.page_content for doc in docs), len(docs)
+    
+    parts: list[str] = []
+    total = 0
+    for doc in docs:
+        sep_len = len(separator) if parts else 0
+        remaining = max_chars - total - sep_len
+        if remaining <= 0:
+            break
+        content = doc.page_content
+        if len(content) > remaining:
+            parts.append(_truncate_to_sentence(content, remaining))
+            break
+        parts.append(content)
+        total += sep_len + len(content)
+    return separator.join(parts), len(parts)
+
+
+class TruncatedEmbeddings(Embeddings):
+    """
+    Matryoshka-truncate embeddings to fewer dimensions.
+    
+    nomic-embed models are trained so the leading dimensions carry most of the
+    signal; keeping e.g. 256 of 768 and re-normalizing shrinks every stored
+    vector 3x while cosine search keeps working.
+    """
+    
+    def __init__(self, base: Embeddings, dimensions: int):
+        self.base = base
+        self.dimensions = dimensions
+    
+    def _truncate(self, vector: list[float]) -> list[float]:
+        truncated = vector[:self.dimensions]
+        norm = math.sqrt(sum(x * x for x in truncated)) or 1.0
+        return [x / norm for x in truncated]
+    
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self._truncate(v) for v in self.base.embed_documents(texts)]
+    
+    def embed_query(self, text: str) -> list[float]:
+        return self._truncate(self.base.embed_query(text))
+
 
 class TazkiyahRAG:
     """
@@ -47,9 +149,12 @@ class TazkiyahRAG:
         self.collection_name = collection_name
         self.persist_directory = persist_directory or config.CHROMA_PERSIST_DIR
         
-        self._embeddings: Optional[OllamaEmbeddings] = None
+        self._embeddings: Optional[Embeddings] = None
         self._llm: Optional[OllamaLLM] = None
         self._vectorstore: Optional[Chroma] = None
+        self._chain: Optional[Runnable] = None
+        self._reranker = None
+        self._count_cache: Optional[int] = None
         
         logger.info(f"TazkiyahRAG initialized: embedding={embedding_model}, llm={llm_model}")
     
@@ -70,14 +175,20 @@ class TazkiyahRAG:
         return text
     
     @property
-    def embeddings(self) -> OllamaEmbeddings:
+    def embeddings(self) -> Embeddings:
         """Lazy-load Ollama embeddings (from langchain-ollama)."""
         if self._embeddings is None:
             logger.info(f"Loading embeddings: {self.embedding_model}")
             self._embeddings = OllamaEmbeddings(
                 model=self.embedding_model,
                 base_url=config.OLLAMA_BASE_URL,
+                client_kwargs=_OLLAMA_CLIENT_KWARGS,
             )
+            if config.EMBEDDING_DIMENSIONS:
+                logger.info(f"Truncating embeddings to {config.EMBEDDING_DIMENSIONS} dims")
+                self._embeddings = TruncatedEmbeddings(
+                    self._embeddings, config.EMBEDDING_DIMENSIONS
+                )
         return self._embeddings
     
     @property
@@ -90,8 +201,12 @@ class TazkiyahRAG:
                 base_url=config.OLLAMA_BASE_URL,
                 temperature=config.LLM_TEMPERATURE,
                 num_predict=config.LLM_MAX_TOKENS,
+                num_ctx=config.LLM_NUM_CTX,
+                num_batch=config.LLM_NUM_BATCH,
+                stop=config.LLM_STOP,
                 top_p=config.LLM_TOP_P,
                 repeat_penalty=config.LLM_REPEAT_PENALTY,
+                client_kwargs=_OLLAMA_CLIENT_KWARGS,
             )
         return self._llm
     
@@ -103,13 +218,28 @@ class TazkiyahRAG:
             logger.info(f"Initializing vector store: {persist_dir}")
             
             # From Context7: langchain-chroma initialization
+            # HNSW metadata only takes effect when the collection is created
             self._vectorstore = Chroma(
                 collection_name=self.collection_name,
                 embedding_function=self.embeddings,
                 persist_directory=persist_dir,
+                collection_metadata={
+                    "hnsw:space": config.HNSW_SPACE,
+                    "hnsw:construction_ef": config.HNSW_CONSTRUCTION_EF,
+                    "hnsw:search_ef": config.HNSW_SEARCH_EF,
+                    "hnsw:M": config.HNSW_M,
+                },
             )
         return self._vectorstore
     
+    @property
+    def chain(self) -> Runnable:
+        """Lazy-build the prompt | LLM | parser chain once (from Context7 LangChain patterns)."""
+        if self._chain is None:
+            prompt = ChatPromptTemplate.from_template(config.RAG_PROMPT_TEMPLATE)
+            self._chain = prompt | self.llm | StrOutputParser()
+        return self._chain
+    
     def add_documents(self, documents: list[Document]) -> list[str]:
         """
         Add documents to vector store.
@@ -130,6 +260,8 @@ class TazkiyahRAG:
         # From Context7: add_documents with ids
         ids = self.vectorstore.add_documents(documents=documents, ids=uuids)
         logger.info(f"Added {len(ids)} documents")
+        if self._count_cache is not None:
+            self._count_cache += len(ids)
         
         return ids
     
@@ -158,6 +290,117 @@ class TazkiyahRAG:
         
         return self.vectorstore.similarity_search_with_score(prefixed_query, k=k)
     
+    def _surah_filter(self, question: str) -> Optional[dict]:
+        """Build a Chroma metadata filter from surah references in the question."""
+        surahs = sorted({
+            int(verse_ref or surah_ref)
+            for verse_ref, surah_ref in _SURAH_REF_PATTERN.findall(question)
+        })
+        if not surahs:
+            return None
+        if len(surahs) == 1:
+            return {"surah_number": surahs[0]}
+        return {"surah_number": {"$in": surahs}}
+    
+    def mmr_search_with_score(
+        self,
+        query: str,
+        k: int = config.TOP_K,
+        fetch_k: Optional[int] = None,
+        filter: Optional[dict] = None,
+    ) -> list[tuple[Document, float]]:
+        """
+        Maximal Marginal Relevance search that keeps the distance scores.
+        
+        Chroma's max_marginal_relevance_search drops scores, so this queries the
+        collection once for fetch_k candidates (with embeddings) and runs MMR here.
+        """
+        fetch_k = fetch_k or 4 * k
+        embedding = self.embeddings.embed_query(self._add_query_prefix(query))
+        results = self.vectorstore._collection.query(
+            query_embeddings=[embedding],
+            n_results=fetch_k,
+            where=filter,
+            include=["documents", "metadatas", "distances", "embeddings"],
+        )
+        if not results["ids"][0]:
+            return []
+        
+        selected = maximal_marginal_relevance(
+            np.array(embedding, dtype=np.float32),
+            results["embeddings"][0],
+            k=k,
+            lambda_mult=config.MMR_LAMBDA,
+        )
+        return [
+            (
+                Document(
+                    page_content=results["documents"][0][i],
+                    metadata=results["metadatas"][0][i] or {},
+                ),
+                results["distances"][0][i],
+            )
+            for i in selected
+        ]
+    
+    @property
+    def reranker(self):
+        """Lazy-load the cross-encoder reranker (optional sentence-transformers dependency)."""
+        if self._reranker is None:
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError as e:
+                raise ImportError(
+                    "USE_RERANKER=true requires sentence-transformers: "
+                    "pip install sentence-transformers"
+                ) from e
+            logger.info(f"Loading reranker: {config.RERANKER_MODEL}")
+            self._reranker = CrossEncoder(config.RERANKER_MODEL)
+        return self._reranker
+    
+    def _rerank(
+        self,
+        question: str,
+        results: list[tuple[Document, float]],
+        k: int,
+    ) -> list[tuple[Document, float]]:
+        """Reorder (doc, score) pairs by cross-encoder relevance and keep the top k."""
+        if len(results) <= 1:
+            return results[:k]
+        rerank_scores = self.reranker.predict(
+            [(question, doc.page_content) for doc, _ in results]
+        )
+        ranked = sorted(zip(rerank_scores, results), key=lambda pair: pair[0], reverse=True)
+        # Keep the vector distance as the reported score so it stays comparable across settings
+        return [result for _, result in ranked[:k]]
+    
+    def retrieve(self, question: str, k: int = config.TOP_K) -> list[tuple[Document, float]]:
+        """
+        Retrieve (doc, score) pairs using the configured SEARCH_TYPE.
+        
+        MMR drops near-duplicate chunks (consecutive verses share wording), and a
+        surah prefilter prunes candidates before vector scoring. Both keep the
+        LLM context short. With USE_RERANKER, RERANK_FETCH_K candidates are
+        retrieved and a cross-encoder picks the final k.
+        """
+        search_filter = self._surah_filter(question) if config.QUERY_PREFILTER else None
+        fetch_k = max(config.RERANK_FETCH_K, k) if config.USE_RERANKER else k
+        
+        def search(filter: Optional[dict]) -> list[tuple[Document, float]]:
+            if config.SEARCH_TYPE == "mmr":
+                return self.mmr_search_with_score(question, k=fetch_k, filter=filter)
+            prefixed_query = self._add_query_prefix(question)
+            return self.vectorstore.similarity_search_with_score(prefixed_query, k=fetch_k, filter=filter)
+        
+        results = search(search_filter)
+        if not results and search_filter is not None:
+            logger.info(f"No documents match prefilter {search_filter}, searching all surahs")
+            results = search(None)
+        
+        if config.USE_RERANKER:
+            results = self._rerank(question, results, k)
+        return results
+    
     def query(self, question: str, return_sources: bool = True, debug_callback=None) -> dict:
         """
         Query the RAG pipeline.
@@ -169,7 +412,14 @@ class TazkiyahRAG:
         
         From Context7: Use ChatPromptTemplate, chain with | operator, StrOutputParser.
         """
-        def log_step(step: str, data: str):
+        verbose = debug_callback is not None or logger.isEnabledFor(logging.INFO)
+        
+        def log_step(step: str, data: Union[str, Callable[[], str]]):
+            # Pass a lambda for expensive messages so they are only built when consumed
+            if not verbose:
+                return
+            if callable(data):
+                data = data()
             logger.info(f"[{step}] {data[:200]}...")
             if debug_callback:
                 debug_callback(step, data)
@@ -177,41 +427,41 @@ class TazkiyahRAG:
         log_step("QUERY", f"User question: {question}")
         
         # Step 1: Retrieve relevant documents with scores
-        log_step("RETRIEVAL", f"Searching for top {config.TOP_K} similar documents...")
-        results_with_scores = self.similarity_search_with_score(question, k=config.TOP_K)
+        log_step("RETRIEVAL", f"Searching for top {config.TOP_K} documents ({config.SEARCH_TYPE})...")
+        results_with_scores = self.retrieve(question, k=config.TOP_K)
         
         source_docs = [doc for doc, score in results_with_scores]
         
         # Log each retrieved document
-        retrieval_details = []
-        for i, (doc, score) in enumerate(results_with_scores, 1):
-            meta = doc.metadata
-            verse_key = meta.get("verse_key", "?")
-            surah = meta.get("surah_name", "")
-            snippet = doc.page_content[:150].replace("\n", " ")
-            detail = f"  [{i}] Score: {score:.4f} | Verse {verse_key} ({surah})\n      {snippet}..."
-            retrieval_details.append(detail)
-        
-        log_step("RETRIEVED_DOCS", f"Found {len(source_docs)} documents:\n" + "\n".join(retrieval_details))
-        
-        # Step 2: Format context
-        context = "\n\n".join(doc.page_content for doc in source_docs)
-        log_step("CONTEXT", f"Built context ({len(context)} chars):\n{context[:500]}...")
+        log_step("RETRIEVED_DOCS", lambda: f"Found {len(source_docs)} documents:\n" + "\n".join(
+            f"  [{i}] Score: {score:.4f} | "
+            f"Verse {doc.metadata.get('verse_key', '?')} ({doc.metadata.get('surah_name', '')})\n"
+            f"      {doc.page_content[:150].translate(_NL_TRANS)}..."
+            for i, (doc, score) in enumerate(results_with_scores, 1)
+        ))
         
-        # Step 3: Create prompt (from Context7 LangChain patterns)
-        prompt = ChatPromptTemplate.from_template(config.RAG_PROMPT_TEMPLATE)
+        # Step 2: Format context within the character budget (results are best-first)
+        context, used = build_context(source_docs)
+        dropped = len(source_docs) - used
+        source_docs = source_docs[:used]
+        results_with_scores = results_with_scores[:used]
+        log_step("CONTEXT", lambda: (
+            f"Built context ({len(context)} chars, {used} docs"
+            f"{f', {dropped} dropped over {config.MAX_CONTEXT_CHARS}-char budget' if dropped else ''}):\n"
+            f"{context[:500]}..."
+        ))
         
-        # Step 4: Format the full prompt for logging
-        full_prompt = config.RAG_PROMPT_TEMPLATE.format(context=context, question=question)
-        log_step("FULL_PROMPT", f"Prompt to LLM ({len(full_prompt)} chars):\n{full_prompt}")
+        # Step 3: Format the full prompt for logging (only when logging is on)
+        def format_full_prompt() -> str:
+            full_prompt = config.RAG_PROMPT_TEMPLATE.format(context=context, question=question)
+            return f"Prompt to LLM ({len(full_prompt)} chars):\n{full_prompt}"
         
-        # Step 5: Build chain with | operator (from Context7)
-        chain = prompt | self.llm | StrOutputParser()
+        log_step("FULL_PROMPT", format_full_prompt)
         
-        # Step 6: Invoke chain
+        # Step 4: Invoke the prebuilt chain
         log_step("LLM_CALL", f"Invoking {self.llm_model}...")
-        result = chain.invoke({"context": context, "question": question})
-        log_step("LLM_RESPONSE", f"Response ({len(result)} chars):\n{result}")
+        result = self.chain.invoke({"context": context, "question": question})
+        log_step("LLM_RESPONSE", lambda: f"Response ({len(result)} chars):\n{result}")
         
         response: dict = {"result": result}
         if return_sources:
@@ -220,23 +470,45 @@ class TazkiyahRAG:
         
         return response
     
-    def get_collection_stats(self) -> dict:
-        """Get vector store statistics."""
-        collection = self.vectorstore._collection
+    def get_collection_stats(self, refresh: bool = False) -> dict:
+        """
+        Get vector store statistics.
+        
+        The document count is cached per instance (kept in sync by add_documents
+        and clear_collection); pass refresh=True to re-read it from ChromaDB.
+        """
+        if refresh or self._count_cache is None:
+            self._count_cache = self.vectorstore._collection.count()
         return {
             "name": self.collection_name,
-            "count": collection.count(),
+            "count": self._count_cache,
             "persist_directory": str(self.persist_directory),
         }
     
-    def clear_collection(self):
-        """Delete all documents from the collection."""
+    def clear_collection(self, keep_collection: bool = False):
+        """
+        Delete all documents from the collection.
+        
+        By default the collection is dropped and lazily re-created on next use,
+        which avoids loading every document id into memory. Pass
+        keep_collection=True to delete by id and keep the collection UUID stable.
+        """
         logger.warning("Clearing vector store collection")
         collection = self.vectorstore._collection
-        all_ids = collection.get()["ids"]
-        if all_ids:
-            collection.delete(ids=all_ids)
-        logger.info(f"Deleted {len(all_ids)} documents")
+        
+        if keep_collection:
+            all_ids = collection.get(include=[])["ids"]
+            if all_ids:
+                collection.delete(ids=all_ids)
+            self._count_cache = 0
+            logger.info(f"Deleted {len(all_ids)} documents")
+            return
+        
+        count = collection.count()
+        self.vectorstore.delete_collection()
+        self._vectorstore = None
+        self._count_cache = 0
+        logger.info(f"Dropped collection with {count} documents")
 
 
 def create_documents_from_chunks(chunks: list[dict]) -> list[Document]:
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Tazkiyah RAG v2 - Question/Answer Cache
+
+SQLite-backed exact-match cache of question -> RAG result.
+
+Repeat questions (common in chat) skip embedding, retrieval and generation
+entirely. Keys include the model/collection settings so switching models in
+.env never serves an answer produced by a different configuration.
+"""
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from langchain_core.documents import Document
+
+from rag_v2 import config
+
+logger = logging.getLogger(__name__)
+
+_conn: Optional[sqlite3.Connection] = None
+_lock = threading.Lock()
+
+
+def init_cache(path: Optional[Path] = None) -> sqlite3.Connection:
+    """Open (or create) the cache database. Safe to call repeatedly."""
+    global _conn
+    with _lock:
+        if _conn is None:
+            path = Path(path or config.QA_CACHE_PATH)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Gradio serves requests from worker threads; access is serialized by _lock
+            _conn = sqlite3.connect(str(path), check_same_thread=False)
+            _conn.execute(
+                "CREATE TABLE IF NOT EXISTS qa (h TEXT PRIMARY KEY, json TEXT, ts INTEGER)"
+            )
+            _conn.commit()
+            logger.info(f"QA cache ready: {path}")
+        return _conn
+
+
+def _key(question: str, scope: str) -> str:
+    normalized = " ".join(question.split()).lower()
+    return hashlib.sha256(f"{scope}\x00{normalized}".encode("utf-8")).hexdigest()
+
+
+def get(question: str, scope: str = "") -> Optional[dict]:
+    """Return a cached query() result, or None on miss/expiry."""
+    conn = init_cache()
+    min_ts = int(time.time()) - config.QA_CACHE_TTL_DAYS * 86400
+    with _lock:
+        row = conn.execute(
+            "SELECT json FROM qa WHERE h = ? AND ts >= ?",
+            (_key(question, scope), min_ts),
+        ).fetchone()
+    if row is None:
+        return None
+
+    payload = json.loads(row[0])
+    return {
+        "result": payload["result"],
+        "source_documents": [
+            Document(page_content=d["page_content"], metadata=d["metadata"])
+            for d in payload["source_documents"]
+        ],
+        "scores": payload["scores"],
+    }
+
+
+def put(question: str, result: dict, scope: str = "", overwrite: bool = True) -> None:
+    """Store a query() result (answer, sources and scores).
+
+    overwrite=False leaves an unexpired entry for the same question in place.
+    """
+    conn = init_cache()
+    payload = json.dumps({
+        "result": result["result"],
+        "source_documents": [
+            {"page_content": d.page_content, "metadata": d.metadata}
+            for d in result.get("source_documents", [])
+        ],
+        "scores": [float(s) for s in result.get("scores", [])],
+    }, ensure_ascii=False)
+    now = int(time.time())
+    min_ts = now - config.QA_CACHE_TTL_DAYS * 86400 if not overwrite else now + 1
+    with _lock:
+        conn.execute(
+            "INSERT INTO qa (h, json, ts) VALUES (?, ?, ?) "
+            "ON CONFLICT(h) DO UPDATE SET json = excluded.json, ts = excluded.ts "
+            "WHERE qa.ts < ?",
+            (_key(question, scope), payload, now, min_ts),
+        )
+        conn.commit()
+
+
+def clear() -> None:
+    """Drop all cached answers (call whenever the index changes)."""
+    conn = init_cache()
+    with _lock:
+        conn.execute("DELETE FROM qa")
+        conn.commit()
+    logger.info("QA cache cleared")
@@ -10,7 +10,10 @@ Usage:
 import logging
 import sys
 import time
+from collections import deque
 from datetime import datetime
+from itertools import islice
+from typing import Optional
 
 import gradio as gr
 
@@ -25,21 +28,25 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 # ─── Debug log buffer ─────────────────────────────────────────────────────────
-debug_logs: list[str] = []
+debug_logs: deque[str] = deque(maxlen=500)
+_debug_text_cache: Optional[str] = None  # Rendered tail; reset on every append
 
 
 def log_debug(message: str):
     """Add timestamped message to debug buffer."""
+    global _debug_text_cache
     ts = datetime.now().strftime("%H:%M:%S.%f")[:-3]
     for line in message.split("\n"):
         debug_logs.append(f"[{ts}] {line}")
+    _debug_text_cache = None
     logger.debug(message)
-    while len(debug_logs) > 500:
-        debug_logs.pop(0)
 
 
 def get_debug_log_text() -> str:
-    return "\n".join(debug_logs[-200:])
+    global _debug_text_cache
+    if _debug_text_cache is None:
+        _debug_text_cache = "\n".join(islice(debug_logs, max(0, len(debug_logs) - 200), None))
+    return _debug_text_cache
 
 
 # ─── RAG instance ─────────────────────────────────────────────────────────────
@@ -103,7 +110,10 @@ def bot_response(history: list[dict]) -> tuple[list[dict], str]:
         })
         return history, get_debug_log_text()
 
+    # Count is cached; re-read only while empty (indexing may run in another process)
     stats = rag.get_collection_stats()
+    if stats["count"] == 0:
+        stats = rag.get_collection_stats(refresh=True)
     if stats["count"] == 0:
         history.append({
             "role": "assistant",
@@ -140,7 +150,7 @@ def bot_response(history: list[dict]) -> tuple[list[dict], str]:
             answer += "\n\n---\n**Sources:**\n"
             for i, doc in enumerate(sources[: config.MAX_SOURCES_DISPLAY], 1):
                 meta = doc.metadata
-                verse_key = meta.get("verse_key", "?")
+                verse_key = meta.get("verse_id", "?")
                 surah = meta.get("surah_name", "")
                 score = scores[i - 1] if i - 1 < len(scores) else 0
                 answer += f"- Verse {verse_key} ({surah}) [score: {score:.4f}]\n"
@@ -156,8 +166,9 @@ def bot_response(history: list[dict]) -> tuple[list[dict], str]:
 
 
 def clear_chat() -> tuple[list[dict], str]:
-    global debug_logs
-    debug_logs = []
+    global _debug_text_cache
+    debug_logs.clear()
+    _debug_text_cache = None
     log_debug("Chat and logs cleared")
     return [], get_debug_log_text()
 
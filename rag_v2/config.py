@@ -44,6 +44,13 @@ OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 EMBED_QUERY_PREFIX = os.getenv("EMBED_QUERY_PREFIX", "search_query: ")
 EMBED_DOCUMENT_PREFIX = os.getenv("EMBED_DOCUMENT_PREFIX", "search_document: ")
 
+# Embedder input truncation by tokens (requires: pip install tokenizers); stored text is never cut
+# EMBED_TOKENIZER is the Hugging Face repo of EMBEDDING_MODEL's tokenizer, e.g.
+#   nomic-ai/nomic-embed-text-v2-moe ("" = off; Ollama truncates to the model's context itself)
+# EMBED_MAX_TOKENS is the model's context: 512 for nomic-embed-text-v2-moe, 8192 for nomic-embed-text / bge-m3
+EMBED_TOKENIZER = os.getenv("EMBED_TOKENIZER", "")
+EMBED_MAX_TOKENS = int(os.getenv("EMBED_MAX_TOKENS", "512"))
+
 # =============================================================================
 # Vector Store
 # =============================================================================
@@ -65,7 +72,9 @@ MIN_RELEVANCE_SCORE = float(os.getenv("MIN_RELEVANCE_SCORE", "0.0"))
 # LLM Generation
 # =============================================================================
 LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.3"))
-LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "1024"))
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "512"))
+LLM_NUM_CTX = int(os.getenv("LLM_NUM_CTX", "4096"))      # Ollama default (2048) truncates 5 long tafsir chunks
+LLM_NUM_BATCH = int(os.getenv("LLM_NUM_BATCH", "512"))   # Prompt-processing batch; larger = faster prefill
 LLM_TOP_P = float(os.getenv("LLM_TOP_P", "0.9"))
 LLM_REPEAT_PENALTY = float(os.getenv("LLM_REPEAT_PENALTY", "1.1"))
 
@@ -120,3 +129,16 @@ MAX_SOURCES_DISPLAY = int(os.getenv("MAX_SOURCES_DISPLAY", "5"))
 # =============================================================================
 EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))
 REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "120"))
+
+# Exact-match question -> answer cache (skips retrieval + LLM for repeat questions).
+# Opt-in: answers are reused for QA_CACHE_TTL_DAYS; index_data clears it after each run
+ENABLE_QA_CACHE = os.getenv("ENABLE_QA_CACHE", "false").lower() == "true"
+QA_CACHE_PATH = Path(os.getenv("QA_CACHE_PATH", str(CHROMA_PERSIST_DIR / "qa_cache.sqlite")))
+QA_CACHE_TTL_DAYS = int(os.getenv("QA_CACHE_TTL_DAYS", "30"))
+
+# On-disk (model, text) -> vector cache; unchanged verses and repeat queries skip Ollama
+ENABLE_EMBEDDING_CACHE = os.getenv("ENABLE_EMBEDDING_CACHE", "true").lower() == "true"
+EMBEDDING_CACHE_PATH = Path(os.getenv(
+    "EMBEDDING_CACHE_PATH",
+    str(CHROMA_PERSIST_DIR / "embedding_cache.sqlite")
+))
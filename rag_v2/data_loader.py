@@ -6,28 +6,41 @@ Loads quran_full_rag_v2.json and converts verses into LangChain Documents.
 
 Strategy:
   - page_content = translation_clean + commentary_clean (the RAG-searchable text)
-  - metadata = surah_number, surah_name, verse_number, id, etc. (for filtering/display)
+  - metadata = verse_id, surah_number, surah_name, verse_number (for filtering/display)
   - Excludes: footnotes, has_commentary, has_footnotes, commentary_annotated, translation_annotated
 """
 import json
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Iterator, Optional
 
 from langchain_core.documents import Document
 
+try:
+    import orjson
+except ImportError:  # Optional speedup; stdlib json works the same
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional; without it the file is loaded in one go
+    ijson = None
+
 from rag_v2 import config
 
 logger = logging.getLogger(__name__)
 
-
 def load_quran_json(filepath: Optional[Path] = None) -> dict:
     """Load the quran_full_rag_v2.json file."""
     filepath = filepath or config.DATA_FILE
     logger.info(f"Loading Quran data from: {filepath}")
 
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if orjson is not None:
+        with open(filepath, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(filepath, "r", encoding="utf-8") as f:
+            data = json.load(f)
 
     total_surahs = len(data.get("surahs", []))
     total_verses = sum(len(s.get("verses", [])) for s in data.get("surahs", []))
@@ -35,10 +48,70 @@ def load_quran_json(filepath: Optional[Path] = None) -> dict:
     return data
 
 
+def _surah_documents(
+    surah: dict,
+    include_commentary: bool,
+    max_content_length: int,
+) -> tuple[list[Document], int]:
+    """Build Documents for one surah. Returns (documents, number truncated)."""
+    contents = []
+    metadatas = []
+    truncated = 0
+
+    # Surah-level fields are shared by every verse's metadata
+    surah_number = surah.get("surah_number", 0)
+    surah_name = surah.get("surah_name", "")
+
+    for verse in surah.get("verses", ()):
+        verse_id = verse.get("id", "")
+        translation_clean = verse.get("translation_clean", "")
+        commentary_clean = verse.get("commentary_clean", "") if include_commentary else ""
+
+        # page_content: translation (always) + commentary (if present and enabled)
+        if translation_clean and commentary_clean:
+            page_content = (
+                f"[Verse {verse_id}] Translation:\n{translation_clean}"
+                f"\n\nCommentary:\n{commentary_clean}"
+            )
+        elif translation_clean:
+            page_content = f"[Verse {verse_id}] Translation:\n{translation_clean}"
+        elif commentary_clean:
+            page_content = f"Commentary:\n{commentary_clean}"
+        else:
+            page_content = ""
+
+        if not page_content.strip():
+            logger.debug(f"Skipping empty verse: {verse_id}")
+            continue
+
+        contents.append(page_content)
+        # Metadata: only the fields used for ids, filtering and display
+        # (anything else is still in quran_full_rag_v2.json)
+        metadatas.append({
+            "verse_id": verse_id,
+            "surah_number": surah_number,
+            "surah_name": surah_name,
+            "verse_number": verse.get("verse_number", 0),
+        })
+
+    # Cap the stored (and LLM context) text; the embedder's own token limit
+    # is applied to its copy at index time (TazkiyahRAGv2.add_documents)
+    for i, page_content in enumerate(contents):
+        if len(page_content) > max_content_length:
+            contents[i] = page_content[:max_content_length - 3] + "..."
+            truncated += 1
+
+    documents = [
+        Document(page_content=page_content, metadata=metadata)
+        for page_content, metadata in zip(contents, metadatas)
+    ]
+    return documents, truncated
+
+
 def create_documents_from_json(
     data: dict,
     include_commentary: bool = True,
-    max_content_length: int = 3000,  # Max chars per document for embedding model
+    max_content_length: int = 3000,  # Max chars per stored document
 ) -> list[Document]:
     """
     Convert quran_full_rag_v2.json into LangChain Documents.
@@ -50,65 +123,18 @@ def create_documents_from_json(
     Args:
         data: Loaded JSON data
         include_commentary: Include commentary in indexed text
-        max_content_length: Max characters per document (exceeds embedding model limits)
+        max_content_length: Max characters per document (stored and sent to the LLM)
                            Long content is truncated, with "..." suffix
     """
     documents = []
     skipped_long = 0
 
     for surah in data.get("surahs", []):
-        surah_number = surah.get("surah_number", 0)
-        surah_name = surah.get("surah_name", "")
-        surah_name_english = surah.get("surah_name_english", "")
-        verse_count = surah.get("verse_count", 0)
-
-        for verse in surah.get("verses", []):
-            verse_id = verse.get("id", "")
-            verse_number = verse.get("verse_number", 0)
-            translation_clean = verse.get("translation_clean", "")
-            commentary_clean = verse.get("commentary_clean", "")
-
-            # Build page_content: translation + commentary (the searchable text)
-            content_parts = []
-
-            # Always include translation
-            if translation_clean:
-                content_parts.append(
-                    f"[Verse {verse_id}] Translation:\n{translation_clean}"
-                )
-
-            # Include commentary if present and enabled
-            if include_commentary and commentary_clean:
-                content_parts.append(f"Commentary:\n{commentary_clean}")
-
-            page_content = "\n\n".join(content_parts)
-
-            if not page_content.strip():
-                logger.debug(f"Skipping empty verse: {verse_id}")
-                continue
-
-            # Truncate if too long (for embedding model limits)
-            if len(page_content) > max_content_length:
-                page_content = page_content[:max_content_length - 3] + "..."
-                skipped_long += 1
-
-            # Build metadata (only structural/identification fields)
-            metadata = {
-                "verse_id": verse_id,
-                "verse_key": verse_id,
-                "surah_number": surah_number,
-                "surah_name": surah_name,
-                "surah_name_english": surah_name_english,
-                "verse_number": verse_number,
-                "verse_count": verse_count,
-                "type": verse.get("type", "verse"),
-                "source": "quran_full_rag_v2.json",
-            }
-
-            documents.append(Document(
-                page_content=page_content,
-                metadata=metadata,
-            ))
+        surah_docs, truncated = _surah_documents(
+            surah, include_commentary, max_content_length
+        )
+        documents.extend(surah_docs)
+        skipped_long += truncated
 
     logger.info(f"Created {len(documents)} documents from Quran data")
     if skipped_long > 0:
@@ -116,10 +142,65 @@ def create_documents_from_json(
     return documents
 
 
+def iter_documents_from_json(
+    filepath: Optional[Path] = None,
+    include_commentary: bool = True,
+    max_content_length: int = 3000,
+) -> Iterator[Document]:
+    """
+    Stream Documents one surah at a time without loading the whole file.
+
+    Uses ijson to parse incrementally, so only the current surah and the
+    caller's batch are resident. Falls back to load_quran_json if ijson
+    is not installed.
+    """
+    filepath = filepath or config.DATA_FILE
+    logger.info(f"Streaming Quran data from: {filepath}")
+
+    if ijson is None:
+        surahs: Iterator[dict] = iter(load_quran_json(filepath).get("surahs", []))
+        yield from _iter_surah_documents(
+            surahs, include_commentary, max_content_length
+        )
+        return
+
+    with open(filepath, "rb") as f:
+        # use_float: plain floats instead of Decimal for any non-integer numbers
+        surahs = ijson.items(f, "surahs.item", use_float=True)
+        yield from _iter_surah_documents(
+            surahs, include_commentary, max_content_length
+        )
+
+
+def _iter_surah_documents(
+    surahs: Iterable[dict],
+    include_commentary: bool,
+    max_content_length: int,
+) -> Iterator[Document]:
+    total = 0
+    skipped_long = 0
+    for surah in surahs:
+        surah_docs, truncated = _surah_documents(
+            surah, include_commentary, max_content_length
+        )
+        total += len(surah_docs)
+        skipped_long += truncated
+        yield from surah_docs
+
+    logger.info(f"Streamed {total} documents from Quran data")
+    if skipped_long > 0:
+        logger.info(f"  (Truncated {skipped_long} documents that exceeded {max_content_length} chars)")
+
+
 def load_and_create_documents(
     filepath: Optional[Path] = None,
     include_commentary: bool = True,
+    max_content_length: int = 3000,
 ) -> list[Document]:
     """Convenience: load JSON + create documents in one call."""
     data = load_quran_json(filepath)
-    return create_documents_from_json(data, include_commentary=include_commentary)
+    return create_documents_from_json(
+        data,
+        include_commentary=include_commentary,
+        max_content_length=max_content_length,
+    )
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tazkiyah RAG v2 - Embedding Cache
+
+SQLite-backed cache of text -> embedding vector, keyed by model + text hash.
+
+Embedding is nearly all of indexing time. With this cache, re-indexing after
+a data tweak (or --clear / --force) only sends new or edited verses to
+Ollama, and repeat questions skip the query embedding round-trip.
+Vectors are stored as raw float32 bytes.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from rag_v2 import config
+
+logger = logging.getLogger(__name__)
+
+
+class CachedEmbeddings(Embeddings):
+    """Wrap an Embeddings model; only cache misses reach the base model."""
+
+    def __init__(self, base: Embeddings, model_name: str, path: Optional[Path] = None):
+        self.base = base
+        self.model_name = model_name
+        path = Path(path or config.EMBEDDING_CACHE_PATH)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Indexer worker threads share the connection; access is serialized by _lock
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS emb (h TEXT PRIMARY KEY, vec BLOB)")
+        self._conn.commit()
+        self._lock = threading.Lock()
+        logger.info(f"Embedding cache ready: {path}")
+
+    def _key(self, kind: str, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\x00{kind}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _lookup(self, keys: list[str]) -> dict[str, list[float]]:
+        found = {}
+        with self._lock:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT h, vec FROM emb WHERE h IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                for h, blob in rows:
+                    found[h] = np.frombuffer(blob, dtype=np.float32).tolist()
+        return found
+
+    def _store(self, items: list[tuple[str, list[float]]]) -> None:
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb (h, vec) VALUES (?, ?)",
+                [(h, np.asarray(v, dtype=np.float32).tobytes()) for h, v in items],
+            )
+            self._conn.commit()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        keys = [self._key("doc", t) for t in texts]
+        found = self._lookup(keys)
+
+        # Embed each distinct missing text once
+        missing = {k: t for k, t in zip(keys, texts) if k not in found}
+        if missing:
+            vectors = self.base.embed_documents(list(missing.values()))
+            new = list(zip(missing.keys(), vectors))
+            self._store(new)
+            found.update(new)
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+        return [found[k] for k in keys]
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self._key("query", text)
+        found = self._lookup([key])
+        if key in found:
+            return found[key]
+        vector = self.base.embed_query(text)
+        self._store([(key, vector)])
+        return vector
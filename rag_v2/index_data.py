@@ -7,10 +7,15 @@ Loads quran_full_rag_v2.json directly and indexes into ChromaDB.
 Usage:
     python -m rag_v2.index_data
     python -m rag_v2.index_data --clear
+    python -m rag_v2.index_data --force    # re-embed verses even if unchanged
+    python -m rag_v2.index_data --clear --unsafe-fast-index
     python -m rag_v2.index_data --data-file path/to/quran.json
 """
 import sys
 import logging
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+from pathlib import Path
 
 import click
 from rich.console import Console
@@ -18,17 +23,42 @@ from rich.progress import (
     Progress,
     TextColumn,
     BarColumn,
-    TaskProgressColumn,
+    MofNCompleteColumn,
     TimeElapsedColumn,
 )
 
-from rag_v2 import config
-from rag_v2.data_loader import load_and_create_documents
+from rag_v2 import cache, config
+from rag_v2.data_loader import iter_documents_from_json
 from rag_v2.rag_pipeline import TazkiyahRAGv2
 
 console = Console()
 logger = logging.getLogger(__name__)
 
+# Journaling/fsync off for bulk rebuilds. A crash mid-index can corrupt the
+# store, so this is opt-in (--unsafe-fast-index) and best paired with --clear.
+# locking_mode=EXCLUSIVE is left out: each worker thread has its own SQLite
+# connection, and an exclusive lock on one would block the others.
+_UNSAFE_PRAGMAS = ("journal_mode=OFF", "synchronous=OFF", "temp_store=MEMORY")
+
+
+def _apply_unsafe_pragmas(rag: TazkiyahRAGv2) -> bool:
+    """Apply _UNSAFE_PRAGMAS to this thread's connection to Chroma's SQLite store.
+
+    Reaches into chromadb internals (Python SQLite backend, chromadb < 1.0);
+    returns False when they are not available, e.g. the Rust-backed client.
+    """
+    server = getattr(rag.vectorstore._client, "_server", None)
+    pool = getattr(getattr(server, "_sysdb", None), "_conn_pool", None)
+    if pool is None:
+        return False
+    conn = pool.connect()
+    try:
+        for pragma in _UNSAFE_PRAGMAS:
+            conn.execute(f"PRAGMA {pragma}")
+    finally:
+        pool.return_to_pool(conn)
+    return True
+
 
 @click.command()
 @click.option(
@@ -38,10 +68,41 @@ logger = logging.getLogger(__name__)
     help=f"Path to Quran JSON. Default: {config.DATA_FILE}",
 )
 @click.option("--clear", is_flag=True, help="Clear existing collection before indexing")
-@click.option("--batch-size", default=100, help="Documents per batch (default: 100)")
-@click.option("--max-content-length", default=3000, help="Max chars per document (default: 3000)")
+@click.option("--force", is_flag=True, help="Re-embed every verse, even if its text is unchanged")
+@click.option("--batch-size", default=200, help="Documents per batch (default: 200)")
+@click.option(
+    "--max-content-length",
+    default=3000,
+    help="Max chars per stored document (default: 3000)",
+)
+@click.option(
+    "--max-tokens",
+    default=config.EMBED_MAX_TOKENS,
+    help=f"Max tokens sent to the embedder per document; 0 = no cut (default: {config.EMBED_MAX_TOKENS})",
+)
 @click.option("--no-commentary", is_flag=True, help="Exclude commentary from indexed text")
-def main(data_file, clear: bool, batch_size: int, max_content_length: int, no_commentary: bool):
+@click.option(
+    "--workers",
+    default=2,
+    type=click.IntRange(1, 8),
+    help="Batches embedded concurrently (default: 2; keep <= OLLAMA_NUM_PARALLEL)",
+)
+@click.option(
+    "--unsafe-fast-index",
+    is_flag=True,
+    help="Disable SQLite journaling/fsync while indexing (a crash can corrupt the DB; rebuild with --clear)",
+)
+def main(
+    data_file,
+    clear: bool,
+    force: bool,
+    batch_size: int,
+    max_content_length: int,
+    max_tokens: int,
+    no_commentary: bool,
+    workers: int,
+    unsafe_fast_index: bool,
+):
     """Index quran_full_rag_v2.json into ChromaDB for RAG v2."""
 
     console.print("\n[bold cyan]Tazkiyah RAG v2 — Indexer[/bold cyan]\n")
@@ -59,7 +120,7 @@ def main(data_file, clear: bool, batch_size: int, max_content_length: int, no_co
     console.print()
 
     # Initialize RAG pipeline
-    rag = TazkiyahRAGv2()
+    rag = TazkiyahRAGv2(embed_max_tokens=max_tokens)
 
     # Clear if requested
     if clear:
@@ -67,50 +128,90 @@ def main(data_file, clear: bool, batch_size: int, max_content_length: int, no_co
         rag.clear_collection()
         console.print("[green]Collection cleared.[/green]\n")
 
-    # Load data
-    from pathlib import Path
-
+    # Stream documents from the data file (never materialized as one list)
     data_path = Path(data_file) if data_file else config.DATA_FILE
-    console.print(f"[cyan]Loading data from:[/cyan] {data_path}")
-
-    documents = load_and_create_documents(
-        filepath=data_path,
-        include_commentary=not no_commentary,
-        max_content_length=max_content_length,
-    )
-    console.print(f"[green]Created {len(documents)} documents[/green]")
+    console.print(f"[cyan]Streaming data from:[/cyan] {data_path}")
     console.print(
         f"  [dim]Content: translation_clean"
         f"{' + commentary_clean' if not no_commentary else ''}[/dim]"
     )
-    console.print(f"  [dim]Max length: {max_content_length} chars[/dim]\n")
+    console.print(f"  [dim]Max length: {max_content_length} chars[/dim]")
+    if max_tokens > 0 and config.EMBED_TOKENIZER:
+        console.print(f"  [dim]Embedder input: {max_tokens} tokens ({config.EMBED_TOKENIZER})[/dim]")
+    console.print()
 
-    if not documents:
-        console.print("[red]No documents created! Check data file.[/red]")
-        sys.exit(1)
+    documents = iter_documents_from_json(
+        filepath=data_path,
+        include_commentary=not no_commentary,
+        max_content_length=max_content_length,
+    )
 
-    # Index in batches
-    console.print("[cyan]Indexing documents...[/cyan]")
+    # Create embeddings client + Chroma collection on the main thread before fan-out
+    _ = rag.vectorstore
+    if unsafe_fast_index:
+        if _apply_unsafe_pragmas(rag):
+            console.print("[yellow]Unsafe fast index: SQLite journaling and fsync disabled[/yellow]")
+        else:
+            console.print(
+                "[yellow]--unsafe-fast-index not supported by the installed chromadb; "
+                "using default durability[/yellow]"
+            )
+            unsafe_fast_index = False
+
+    # Index in batches; embedding round-trips to Ollama overlap across workers
+    console.print(f"[cyan]Indexing documents ({workers} workers)...[/cyan]")
     with Progress(
         TextColumn("[bold blue]{task.description}"),
         BarColumn(),
-        TaskProgressColumn(),
+        MofNCompleteColumn(),
         TimeElapsedColumn(),
         console=console,
     ) as progress:
-        task = progress.add_task("Indexing", total=len(documents))
+        task = progress.add_task("Indexing", total=None)
+        total_seen = 0
         total_indexed = 0
 
-        for i in range(0, len(documents), batch_size):
-            batch = documents[i : i + batch_size]
-            ids = rag.add_documents(batch)
-            total_indexed += len(ids)
-            progress.update(task, advance=len(batch))
+        # Worker threads get their own SQLite connections, so apply the PRAGMAs to each
+        with ThreadPoolExecutor(
+            max_workers=workers,
+            initializer=_apply_unsafe_pragmas if unsafe_fast_index else None,
+            initargs=(rag,),
+        ) as executor:
+            # Bounded in-flight window so queued batches don't pile up in memory
+            pending: dict = {}
+
+            def drain(return_when) -> None:
+                nonlocal total_seen, total_indexed
+                done, _ = wait(pending, return_when=return_when)
+                for future in done:
+                    batch_len = pending.pop(future)
+                    total_seen += batch_len
+                    total_indexed += len(future.result())
+                    progress.update(task, advance=batch_len)
+
+            while batch := list(islice(documents, batch_size)):
+                if len(pending) >= workers * 2:
+                    drain(FIRST_COMPLETED)
+                pending[executor.submit(rag.add_documents, batch, force)] = len(batch)
+
+            if pending:
+                drain(ALL_COMPLETED)
+
+    # Cached answers may cite the old index; drop them once per run
+    if config.ENABLE_QA_CACHE and (clear or total_indexed):
+        cache.clear()
+
+    if total_seen == 0:
+        console.print("[red]No documents created! Check data file.[/red]")
+        sys.exit(1)
 
     # Report stats
     console.print()
     stats = rag.get_collection_stats()
-    console.print("[bold green]Indexing complete![/bold green]")
+    console.print(
+        f"[bold green]Indexing complete![/bold green] ({total_indexed} documents added/updated, "
+        f"{total_seen - total_indexed} unchanged)"
+    )
     console.print(f"  [dim]Collection:[/dim]  {stats['name']}")
     console.print(f"  [dim]Documents:[/dim]   {stats['count']}")
     console.print(f"  [dim]Embedding:[/dim]   {stats['embedding_model']}")
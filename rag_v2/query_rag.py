@@ -7,6 +7,7 @@ Usage:
     python -m rag_v2.query_rag --no-sources "Explain Al-Fatiha"
     python -m rag_v2.query_rag --top-k 10 "What does the Quran say about patience?"
 """
+import asyncio
 import sys
 import logging
 
@@ -56,7 +57,14 @@ def main(question: str, sources: bool, top_k: int):
     original_top_k = config.TOP_K
     config.TOP_K = top_k
 
-    result = rag.query(question, return_sources=sources)
+    # Async path: model load overlaps with retrieval on a cold Ollama
+    async def ask() -> dict:
+        try:
+            return await rag.aquery(question, return_sources=sources)
+        finally:
+            await rag.aclose()
+
+    result = asyncio.run(ask())
 
     config.TOP_K = original_top_k
 
@@ -75,7 +83,7 @@ def main(question: str, sources: bool, top_k: int):
         scores = result.get("scores", [])
         for i, doc in enumerate(result["source_documents"], 1):
             meta = doc.metadata
-            verse_key = meta.get("verse_key", "?")
+            verse_key = meta.get("verse_id", "?")
             surah = meta.get("surah_name", "")
             score = scores[i - 1] if i - 1 < len(scores) else 0
 
@@ -11,19 +11,31 @@ Key differences from v1:
   - Model/embedding switchable from .env
   - Uses ChatOllama (chat model) instead of OllamaLLM
 """
+import asyncio
+import hashlib
 import logging
+from contextlib import AsyncExitStack
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
-from uuid import uuid4
 
+import httpx
+import numpy as np
 from langchain_ollama import OllamaEmbeddings, ChatOllama
+from ollama import AsyncClient
 from langchain_chroma import Chroma
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.documents import Document
 from langchain_core.output_parsers import StrOutputParser
-from langchain_core.runnables import RunnablePassthrough
+from langchain_core.runnables import Runnable, RunnablePassthrough
 
-from rag_v2 import config
+from rag_v2 import cache, config
+from rag_v2.embedding_cache import CachedEmbeddings
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:  # Optional; without it the embedder gets the stored text as is
+    Tokenizer = None
 
 # Setup logging
 logging.basicConfig(
@@ -32,6 +44,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Between retrieved documents in the LLM context
+_CONTEXT_SEPARATOR = "\n\n---\n\n"
+
+# Passed through langchain-ollama to the underlying httpx client so every
+# embed/chat call reuses a warm keep-alive connection to Ollama
+# (8 covers the indexer's maximum --workers)
+_OLLAMA_CLIENT_KWARGS = {
+    "timeout": config.REQUEST_TIMEOUT,
+    "limits": httpx.Limits(
+        max_connections=8,
+        max_keepalive_connections=8,
+        keepalive_expiry=300,
+    ),
+}
+
+
+# Tokens left free for BOS/EOS and the "search_document: " prefix
+_RESERVED_TOKENS = 16
+
+
+def _skip_step(step: str, data: str) -> None:
+    """log_step stand-in when nothing would record the step."""
+
+
+@lru_cache(maxsize=None)
+def _load_tokenizer(name: str):
+    """Load the embedding model's HF fast tokenizer once; None if unavailable."""
+    if Tokenizer is None or not name:
+        return None
+    try:
+        tokenizer = Tokenizer.from_pretrained(name)
+    except Exception as e:
+        logger.warning(f"Could not load tokenizer '{name}' ({e}); embedding untruncated text")
+        return None
+    tokenizer.no_truncation()
+    tokenizer.no_padding()
+    logger.info(f"Truncating embedder input by token count with tokenizer: {name}")
+    return tokenizer
+
 
 class TazkiyahRAGv2:
     """
@@ -48,15 +99,27 @@ class TazkiyahRAGv2:
         llm_model: str = config.LLM_MODEL,
         collection_name: str = config.COLLECTION_NAME,
         persist_directory: Optional[Path] = None,
+        embed_max_tokens: int = config.EMBED_MAX_TOKENS,
     ):
         self.embedding_model = embedding_model
         self.llm_model = llm_model
         self.collection_name = collection_name
         self.persist_directory = persist_directory or config.CHROMA_PERSIST_DIR
+        self.embed_max_tokens = embed_max_tokens
 
-        self._embeddings: Optional[OllamaEmbeddings] = None
+        self._embeddings: Optional[OllamaEmbeddings | CachedEmbeddings] = None
         self._llm: Optional[ChatOllama] = None
         self._vectorstore: Optional[Chroma] = None
+        self._chain: Optional[Runnable] = None
+        self._count_cache: Optional[int] = None
+        self._async_client: Optional[AsyncClient] = None
+        self._async_stack = AsyncExitStack()
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Embedding prefixes, resolved once (empty for models that don't use them)
+        needs_prefix = self._needs_prefix()
+        self._query_prefix = config.EMBED_QUERY_PREFIX if needs_prefix else ""
+        self._document_prefix = config.EMBED_DOCUMENT_PREFIX if needs_prefix else ""
 
         logger.info(
             f"TazkiyahRAGv2 initialized: embedding={embedding_model}, "
@@ -78,26 +141,38 @@ class TazkiyahRAGv2:
         return "v2-moe" in self.embedding_model
 
     def _add_query_prefix(self, query: str) -> str:
-        if self._needs_prefix() and not query.startswith(config.EMBED_QUERY_PREFIX):
-            return f"{config.EMBED_QUERY_PREFIX}{query}"
-        return query
-
-    def _add_document_prefix(self, text: str) -> str:
-        if self._needs_prefix() and not text.startswith(config.EMBED_DOCUMENT_PREFIX):
-            return f"{config.EMBED_DOCUMENT_PREFIX}{text}"
-        return text
+        return f"{self._query_prefix}{query}"
+
+    def _embedding_texts(self, texts: list[str]) -> list[str]:
+        """Prefixed copies of texts, cut to the embedder's token limit (stored text is untouched)."""
+        tokenizer = _load_tokenizer(config.EMBED_TOKENIZER) if self.embed_max_tokens > 0 else None
+        if tokenizer is not None:
+            limit = max(self.embed_max_tokens - _RESERVED_TOKENS, 1)
+            encodings = tokenizer.encode_batch(texts, add_special_tokens=False)
+            texts = [
+                # Cut the original text at the last kept token's end offset
+                # (decode() would re-normalize whitespace/casing)
+                text[:enc.offsets[limit - 1][1]] if len(enc.ids) > limit else text
+                for text, enc in zip(texts, encodings)
+            ]
+        prefix = self._document_prefix
+        return [prefix + text for text in texts]
 
     # ─── Lazy-loaded components ───────────────────────────────────────────
 
     @property
-    def embeddings(self) -> OllamaEmbeddings:
-        """Lazy-load Ollama embeddings."""
+    def embeddings(self) -> OllamaEmbeddings | CachedEmbeddings:
+        """Lazy-load Ollama embeddings (behind the on-disk embedding cache if enabled)."""
         if self._embeddings is None:
             logger.info(f"Loading embeddings: {self.embedding_model}")
-            self._embeddings = OllamaEmbeddings(
+            embeddings = OllamaEmbeddings(
                 model=self.embedding_model,
                 base_url=config.OLLAMA_BASE_URL,
+                client_kwargs=_OLLAMA_CLIENT_KWARGS,
             )
+            if config.ENABLE_EMBEDDING_CACHE:
+                embeddings = CachedEmbeddings(embeddings, self.embedding_model)
+            self._embeddings = embeddings
         return self._embeddings
 
     @property
@@ -110,8 +185,11 @@ class TazkiyahRAGv2:
                 base_url=config.OLLAMA_BASE_URL,
                 temperature=config.LLM_TEMPERATURE,
                 num_predict=config.LLM_MAX_TOKENS,
+                num_ctx=config.LLM_NUM_CTX,
+                num_batch=config.LLM_NUM_BATCH,
                 top_p=config.LLM_TOP_P,
                 repeat_penalty=config.LLM_REPEAT_PENALTY,
+                client_kwargs=_OLLAMA_CLIENT_KWARGS,
             )
         return self._llm
 
@@ -128,38 +206,110 @@ class TazkiyahRAGv2:
             )
         return self._vectorstore
 
+    @property
+    def chain(self) -> Runnable:
+        """Lazy-build the prompt | ChatOllama | parser chain once; the prompt never changes."""
+        if self._chain is None:
+            prompt = ChatPromptTemplate.from_messages([
+                ("system", config.SYSTEM_PROMPT),
+                ("human", config.RAG_PROMPT_TEMPLATE),
+            ])
+            self._chain = prompt | self.llm | StrOutputParser()
+        return self._chain
+
+    def _cache_scope(self) -> str:
+        """Settings that change the answer; part of every QA cache key."""
+        prompts = hashlib.blake2b(
+            f"{config.SYSTEM_PROMPT}\x00{config.RAG_PROMPT_TEMPLATE}".encode("utf-8"),
+            digest_size=8,
+        ).hexdigest()
+        return (
+            f"{self.llm_model}|{self.embedding_model}|{self.collection_name}|"
+            f"{config.TOP_K}|{config.SEARCH_TYPE}|{config.LLM_TEMPERATURE}|{prompts}"
+        )
+
     # ─── Document management ──────────────────────────────────────────────
 
-    def add_documents(self, documents: list[Document]) -> list[str]:
-        """Add documents to vector store with UUID ids."""
+    @staticmethod
+    def _document_id(doc: Document) -> str:
+        """Stable id: the verse key, or a content hash for documents without one."""
+        verse_id = doc.metadata.get("verse_id")
+        if verse_id:
+            return str(verse_id)
+        return hashlib.blake2b(doc.page_content.encode("utf-8"), digest_size=16).hexdigest()
+
+    def add_documents(self, documents: list[Document], force: bool = False) -> list[str]:
+        """
+        Upsert documents keyed by verse id, so re-indexing never duplicates.
+
+        Documents whose stored text is unchanged are skipped (not re-embedded)
+        unless force=True. Returns the ids actually written.
+        The QA cache is not touched; clear it once the whole ingestion is done.
+        """
         total = len(documents)
         logger.info(f"Adding {total} documents to vector store")
 
-        # Add document prefix for nomic-embed-text-v2-moe
-        if self._needs_prefix():
-            for doc in documents:
-                doc.page_content = self._add_document_prefix(doc.page_content)
+        ids = [self._document_id(doc) for doc in documents]
+        texts = [doc.page_content for doc in documents]
+        collection = self.vectorstore._collection
 
-        uuids = [str(uuid4()) for _ in range(total)]
-        ids = self.vectorstore.add_documents(documents=documents, ids=uuids)
-        logger.info(f"Successfully added {len(ids)} documents")
+        if not force:
+            existing = collection.get(ids=ids, include=["documents"])
+            stored = dict(zip(existing["ids"], existing["documents"]))
+            changed = [
+                i for i, (doc_id, text) in enumerate(zip(ids, texts))
+                if stored.get(doc_id) != text
+            ]
+            if len(changed) < total:
+                logger.info(f"Skipping {total - len(changed)} unchanged documents")
+                documents = [documents[i] for i in changed]
+                ids = [ids[i] for i in changed]
+                texts = [texts[i] for i in changed]
+            if not documents:
+                return []
+
+        # Embed the whole batch in one Ollama request, then write straight to the
+        # Chroma collection (skips LangChain's per-document wrapping).
+        # One float32 array: half the bytes of Python floats, no per-element boxing.
+        # The document prefix (nomic-embed-text-v2-moe) and token truncation apply to
+        # the embedder's copy only; Documents and stored text stay whole and unprefixed.
+        vectors = np.asarray(
+            self.embeddings.embed_documents(self._embedding_texts(texts)),
+            dtype=np.float32,
+        )
+        collection.upsert(
+            ids=ids,
+            embeddings=vectors,
+            documents=texts,
+            metadatas=[doc.metadata for doc in documents],
+        )
+        logger.info(f"Successfully upserted {len(ids)} documents")
+        # Upserts may replace rather than add; re-count on next stats call
+        self._count_cache = None
         return ids
 
     def clear_collection(self):
         """Delete all documents from the collection."""
         logger.warning("Clearing vector store collection")
         collection = self.vectorstore._collection
-        all_ids = collection.get()["ids"]
-        if all_ids:
-            collection.delete(ids=all_ids)
-        logger.info(f"Deleted {len(all_ids)} documents")
-
-    def get_collection_stats(self) -> dict:
-        """Get vector store statistics."""
-        collection = self.vectorstore._collection
+        total = collection.count()
+        if total:
+            # Server-side delete by metadata every verse carries (surahs are 1-114);
+            # no ids are round-tripped through Python
+            collection.delete(where={"surah_number": {"$gt": 0}})
+            # Anything indexed from elsewhere: delete in bounded chunks
+            while ids := collection.get(limit=1000, include=[])["ids"]:
+                collection.delete(ids=ids)
+        self._count_cache = 0
+        logger.info(f"Deleted {total} documents")
+
+    def get_collection_stats(self, refresh: bool = False) -> dict:
+        """Get vector store statistics (document count cached; refresh=True re-reads it)."""
+        if refresh or self._count_cache is None:
+            self._count_cache = self.vectorstore._collection.count()
         return {
             "name": self.collection_name,
-            "count": collection.count(),
+            "count": self._count_cache,
             "persist_directory": str(self.persist_directory),
             "embedding_model": self.embedding_model,
             "llm_model": self.llm_model,
@@ -167,23 +317,121 @@ class TazkiyahRAGv2:
 
     # ─── Search ───────────────────────────────────────────────────────────
 
+    def _query_collection(self, query: str, k: int) -> list[tuple[Document, float]]:
+        """Embed the prefixed query and search the Chroma collection directly."""
+        embedding = self.embeddings.embed_query(self._add_query_prefix(query))
+        results = self.vectorstore._collection.query(
+            query_embeddings=[embedding],
+            n_results=k,
+            include=["documents", "metadatas", "distances"],
+        )
+        return [
+            (Document(page_content=text, metadata=metadata or {}), distance)
+            for text, metadata, distance in zip(
+                results["documents"][0], results["metadatas"][0], results["distances"][0]
+            )
+        ]
+
     def similarity_search(self, query: str, k: int = config.TOP_K) -> list[Document]:
         """Perform similarity search."""
-        prefixed_query = self._add_query_prefix(query)
         logger.info(f"Similarity search: '{query[:60]}...' (k={k})")
-        results = self.vectorstore.similarity_search(prefixed_query, k=k)
+        results = [doc for doc, _ in self._query_collection(query, k)]
         logger.info(f"Found {len(results)} results")
         return results
 
     def similarity_search_with_score(
         self, query: str, k: int = config.TOP_K
     ) -> list[tuple[Document, float]]:
-        """Similarity search with relevance scores."""
-        prefixed_query = self._add_query_prefix(query)
-        return self.vectorstore.similarity_search_with_score(prefixed_query, k=k)
+        """Similarity search with relevance scores (Chroma distance; lower = closer)."""
+        return self._query_collection(query, k)
 
     # ─── RAG Query ────────────────────────────────────────────────────────
 
+    @staticmethod
+    def _step_logger(debug_callback):
+        """Build log_step(step, data); a no-op when INFO is off and no callback is attached."""
+        log_info = logger.isEnabledFor(logging.INFO)
+        if not log_info and debug_callback is None:
+            return _skip_step
+
+        def log_step(step: str, data: str):
+            if log_info:
+                logger.info(f"[{step}] {data[:200]}")
+            if debug_callback:
+                debug_callback(step, data)
+        return log_step
+
+    def _cached_answer(self, question: str, return_sources: bool, log_step) -> Optional[dict]:
+        """QA cache lookup; None on miss."""
+        if not config.ENABLE_QA_CACHE:
+            return None
+        cached = cache.get(question, scope=self._cache_scope())
+        # Entries cached by a return_sources=False call carry no scores
+        if cached is None or (
+            return_sources and len(cached["scores"]) != len(cached["source_documents"])
+        ):
+            return None
+        log_step("CACHE_HIT", f"Answer served from QA cache ({len(cached['result'])} chars)")
+        if not return_sources:
+            return {"result": cached["result"]}
+        return cached
+
+    def _retrieve(
+        self, question: str, return_sources: bool, log_step
+    ) -> tuple[list[Document], list[float]]:
+        """Retrieve top-k documents (scores only when the caller wants them)."""
+        log_step("RETRIEVAL", f"Searching top {config.TOP_K} documents...")
+        if return_sources:
+            results_with_scores = self.similarity_search_with_score(
+                question, k=config.TOP_K
+            )
+            source_docs = [doc for doc, score in results_with_scores]
+            scores = [score for _, score in results_with_scores]
+        else:
+            source_docs = self.similarity_search(question, k=config.TOP_K)
+            scores = []
+
+        # Log retrieval details (skip the per-doc formatting when nobody reads it)
+        if log_step is not _skip_step:
+            retrieval_details = []
+            for i, doc in enumerate(source_docs, 1):
+                meta = doc.metadata
+                verse_key = meta.get("verse_id", "?")
+                surah = meta.get("surah_name", "")
+                snippet = doc.page_content[:120].replace("\n", " ")
+                score_text = f"Score: {scores[i - 1]:.4f} | " if scores else ""
+                retrieval_details.append(
+                    f"  [{i}] {score_text}{verse_key} ({surah}) | {snippet}..."
+                )
+            log_step(
+                "RETRIEVED_DOCS",
+                f"Found {len(source_docs)} docs:\n" + "\n".join(retrieval_details),
+            )
+        return source_docs, scores
+
+    def _build_response(
+        self,
+        question: str,
+        result: str,
+        source_docs: list[Document],
+        scores: list[float],
+        return_sources: bool,
+    ) -> dict:
+        if config.ENABLE_QA_CACHE:
+            # A scoreless (return_sources=False) result must not replace a full entry
+            cache.put(
+                question,
+                {"result": result, "source_documents": source_docs, "scores": scores},
+                scope=self._cache_scope(),
+                overwrite=return_sources,
+            )
+
+        response: dict = {"result": result}
+        if return_sources:
+            response["source_documents"] = source_docs
+            response["scores"] = scores
+        return response
+
     def query(
         self,
         question: str,
@@ -203,58 +451,109 @@ class TazkiyahRAGv2:
         Returns:
             {"result": str, "source_documents": list[Doc], "scores": list[float]}
         """
-        def log_step(step: str, data: str):
-            logger.info(f"[{step}] {data[:200]}")
-            if debug_callback:
-                debug_callback(step, data)
-
+        log_step = self._step_logger(debug_callback)
         log_step("QUERY", f"User question: {question}")
 
-        # Step 1: Retrieve relevant documents with scores
-        log_step("RETRIEVAL", f"Searching top {config.TOP_K} documents...")
-        results_with_scores = self.similarity_search_with_score(
-            question, k=config.TOP_K
-        )
-        source_docs = [doc for doc, score in results_with_scores]
-
-        # Log retrieval details
-        retrieval_details = []
-        for i, (doc, score) in enumerate(results_with_scores, 1):
-            meta = doc.metadata
-            verse_key = meta.get("verse_key", "?")
-            surah = meta.get("surah_name", "")
-            snippet = doc.page_content[:120].replace("\n", " ")
-            retrieval_details.append(
-                f"  [{i}] Score: {score:.4f} | {verse_key} ({surah}) | {snippet}..."
-            )
-        log_step(
-            "RETRIEVED_DOCS",
-            f"Found {len(source_docs)} docs:\n" + "\n".join(retrieval_details),
-        )
+        cached = self._cached_answer(question, return_sources, log_step)
+        if cached is not None:
+            return cached
+
+        # Step 1: Retrieve relevant documents
+        source_docs, scores = self._retrieve(question, return_sources, log_step)
 
         # Step 2: Build context
-        context = "\n\n---\n\n".join(doc.page_content for doc in source_docs)
+        context = _CONTEXT_SEPARATOR.join([doc.page_content for doc in source_docs])
         log_step("CONTEXT", f"Context ({len(context)} chars)")
 
-        # Step 3: Create prompt
-        prompt = ChatPromptTemplate.from_messages([
-            ("system", config.SYSTEM_PROMPT),
-            ("human", config.RAG_PROMPT_TEMPLATE),
-        ])
+        # Step 3: Invoke the prebuilt chain (LangSmith traces this automatically)
+        log_step("LLM_CALL", f"Invoking {self.llm_model}...")
+        result = self.chain.invoke({"context": context, "question": question})
+        log_step("LLM_RESPONSE", f"Response ({len(result)} chars)")
+
+        return self._build_response(question, result, source_docs, scores, return_sources)
+
+    async def _get_async_client(self) -> AsyncClient:
+        """Ollama async client for the warm-up, opened once per event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_loop is not None and self._async_loop is not loop:
+            # httpx pools are bound to the loop that opened them; close the old ones
+            try:
+                await self.aclose()
+            except RuntimeError as e:  # Previous loop already closed
+                logger.debug(f"Closing Ollama clients from a finished event loop: {e}")
+        self._async_loop = loop
+        if self._async_client is None:
+            self._async_client = await self._async_stack.enter_async_context(
+                AsyncClient(host=config.OLLAMA_BASE_URL, **_OLLAMA_CLIENT_KWARGS)
+            )
+        return self._async_client
+
+    async def aclose(self) -> None:
+        """
+        Close the async Ollama connections (call before the event loop ends).
+
+        The chat model is rebuilt on next use, since its async client is closed too.
+        """
+        stack, self._async_stack = self._async_stack, AsyncExitStack()
+        self._async_client = None
+        self._async_loop = None
+        llm, self._llm, self._chain = self._llm, None, None
+        try:
+            await stack.aclose()
+        finally:
+            # langchain-ollama has no public close(); its ollama client is a private attr
+            llm_client = getattr(llm, "_async_client", None)
+            if llm_client is not None:
+                await llm_client.close()
+
+    async def _warm_up_llm(self) -> None:
+        """Ask Ollama to load the chat model (empty prompt = load only, no generation)."""
+        try:
+            client = await self._get_async_client()
+            # Same num_ctx/num_batch as the real call, or Ollama would reload the runner
+            await client.generate(
+                model=self.llm_model,
+                prompt="",
+                options={"num_ctx": config.LLM_NUM_CTX, "num_batch": config.LLM_NUM_BATCH},
+            )
+        except Exception as e:  # Warm-up is best effort; the real call reports errors
+            logger.debug(f"LLM warm-up failed: {e}")
+
+    async def aquery(
+        self,
+        question: str,
+        return_sources: bool = True,
+        debug_callback=None,
+    ) -> dict:
+        """
+        Async query(): same arguments and result.
+
+        Retrieval (in a worker thread) and LLM model loading run concurrently,
+        so a cold model's load time is hidden behind the vector search.
+        """
+        log_step = self._step_logger(debug_callback)
+        log_step("QUERY", f"User question: {question}")
 
-        # Step 4: Build and invoke chain (LangSmith traces this automatically)
-        chain = prompt | self.llm | StrOutputParser()
+        cached = self._cached_answer(question, return_sources, log_step)
+        if cached is not None:
+            return cached
 
+        # Step 1: Retrieve relevant documents while the LLM loads
+        (source_docs, scores), _ = await asyncio.gather(
+            asyncio.to_thread(self._retrieve, question, return_sources, log_step),
+            self._warm_up_llm(),
+        )
+
+        # Step 2: Build context
+        context = _CONTEXT_SEPARATOR.join([doc.page_content for doc in source_docs])
+        log_step("CONTEXT", f"Context ({len(context)} chars)")
+
+        # Step 3: Invoke the prebuilt chain asynchronously
         log_step("LLM_CALL", f"Invoking {self.llm_model}...")
-        result = chain.invoke({"context": context, "question": question})
+        result = await self.chain.ainvoke({"context": context, "question": question})
         log_step("LLM_RESPONSE", f"Response ({len(result)} chars)")
 
-        response: dict = {"result": result}
-        if return_sources:
-            response["source_documents"] = source_docs
-            response["scores"] = [score for _, score in results_with_scores]
-
-        return response
+        return self._build_response(question, result, source_docs, scores, return_sources)
 
     def get_retriever(self, k: int = config.TOP_K):
         """Get a LangChain retriever for advanced chain composition."""
@@ -1,26 +1,50 @@
 """
 Parallel Tafsir Fetcher
 
-Fetches tafsir content for verses using ThreadPoolExecutor.
+Fetches tafsir content for verses on an asyncio event loop (aiohttp),
+falling back to ThreadPoolExecutor when aiohttp is not installed.
 Respects the circuit breaker state from the API client.
 
 Author: Tazkiyah Project
 """
 
+import asyncio
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
 from dataclasses import dataclass
-from typing import Any
+from pathlib import Path
+from typing import Any, Callable
 
 from tqdm import tqdm
 
-from quran_api import QuranAPIClient
+from quran_api import QuranAPIClient, aiohttp
 
 # Configure module logger
 logger = logging.getLogger(__name__)
 
+# Cache-miss marker (None is a valid cached value: tafsir not found)
+_MISSING = object()
 
-@dataclass
+
+def _parse_verse_key(verse_key: Any) -> tuple[int, int] | None:
+    """Parse "chapter:verse" into ints; None for a malformed key."""
+    try:
+        chapter, verse = verse_key.split(":")
+        return int(chapter), int(verse)
+    except (AttributeError, ValueError):
+        return None
+
+
+@dataclass(slots=True, frozen=True)
 class TafsirResult:
     """Result of a tafsir fetch operation."""
     
@@ -34,12 +58,15 @@ class TafsirResult:
 
 class TafsirFetcher:
     """
-    Parallel tafsir fetcher using ThreadPoolExecutor.
+    Parallel tafsir fetcher using asyncio + aiohttp (threads as fallback).
     
     Features:
-    - Configurable concurrency (1-10 threads)
+    - Configurable concurrency (1-10 in-flight requests)
+    - Whole-chapter requests (by_chapter), per-ayah only as a fallback
     - Respects circuit breaker state from API client
     - Graceful degradation on errors
+    - LRU memo of fetched tafsirs (repeat/retried keys skip the network)
+    - Persistent SQLite cache, so re-runs read tafsirs locally
     - Progress tracking with tqdm
     
     Example:
@@ -50,6 +77,10 @@ class TafsirFetcher:
     
     MIN_CONCURRENCY = 1
     MAX_CONCURRENCY = 10
+    CACHE_SIZE = 16384  # (tafsir_id, verse_key) entries; a full Quran for 2-3 tafsirs
+    DEFAULT_DISK_CACHE = "tafsir_cache.db"
+    # Below this many verses of a chapter, per-ayah calls beat paging the chapter
+    BULK_MIN_VERSES = 5
     
     def __init__(
         self,
@@ -58,6 +89,7 @@ class TafsirFetcher:
         tafsir_names: dict[int, str] | None = None,
         concurrency: int = 3,
         show_progress: bool = True,
+        disk_cache: str | Path | None = DEFAULT_DISK_CACHE,
     ) -> None:
         """
         Initialize the tafsir fetcher.
@@ -66,8 +98,9 @@ class TafsirFetcher:
             api_client: QuranAPIClient instance (shared, thread-safe)
             tafsir_ids: List of tafsir IDs to fetch
             tafsir_names: Optional mapping of tafsir ID to name
-            concurrency: Number of parallel threads (1-10)
+            concurrency: Number of in-flight requests (1-10)
             show_progress: Whether to show progress bar
+            disk_cache: SQLite file for persistent tafsir caching (None to disable)
         """
         self.api_client = api_client
         self.tafsir_ids = tafsir_ids
@@ -80,13 +113,39 @@ class TafsirFetcher:
             min(concurrency, self.MAX_CONCURRENCY)
         )
         
-        # Statistics
-        self.stats = {
-            "total_requests": 0,
-            "successful": 0,
-            "failed": 0,
-            "not_found": 0,
-        }
+        # LRU memo: (tafsir_id, verse_key) -> tafsir dict or None (not found).
+        # Errors are never cached, so failed keys are retried on the next call.
+        self._cache: OrderedDict[tuple[int, str], dict[str, Any] | None] = OrderedDict()
+        self._cache_lock = threading.Lock()
+        
+        # Tafsir text per (tafsir_id, verse_key) never changes: persist it across
+        # runs. Shares _cache_lock, so the one connection is never used concurrently.
+        self._db: sqlite3.Connection | None = None
+        if disk_cache is not None:
+            self._db = sqlite3.connect(
+                str(disk_cache), check_same_thread=False, isolation_level=None
+            )
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tafsir_cache("
+                "tafsir_id INTEGER, verse_key TEXT, text TEXT, "
+                "PRIMARY KEY(tafsir_id, verse_key)) WITHOUT ROWID"
+            )
+        
+        # Verses known to have no tafsir (systematic gaps, e.g. grouped ayahs).
+        # An exact set, not an LRU: a few thousand keys at most, and a lookup
+        # here skips both the SQLite query and the request.
+        self._not_found: set[tuple[int, str]] = set()
+        if self._db is not None:
+            self._not_found.update(self._db.execute(
+                "SELECT tafsir_id, verse_key FROM tafsir_cache WHERE text IS NULL"
+            ))
+        
+        # Statistics. Per-verse outcomes (successful/failed/not_found) come from
+        # a per-ayah request, the cache, or a by_chapter response, so they sum to
+        # total_requests + cache_hits + chapter_hits.
+        self.reset_stats()
         
         logger.info(
             f"TafsirFetcher initialized: tafsirs={tafsir_ids}, "
@@ -116,45 +175,224 @@ class TafsirFetcher:
         Returns:
             TafsirResult with success/failure status
         """
-        tafsir_name = self.tafsir_names.get(tafsir_id, f"Tafsir {tafsir_id}")
+        tafsir = self._cache_get(tafsir_id, verse_key)
+        if tafsir is not _MISSING:
+            return self._make_result(verse_key, tafsir_id, tafsir=tafsir, from_cache=True)
         
         try:
             tafsir = self.api_client.get_tafsir_by_ayah(tafsir_id, verse_key)
+        except Exception as e:
+            return self._make_result(verse_key, tafsir_id, error=e)
+        self._cache_put(tafsir_id, verse_key, tafsir)
+        return self._make_result(verse_key, tafsir_id, tafsir=tafsir)
+    
+    async def _fetch_single_tafsir_async(
+        self,
+        session: "aiohttp.ClientSession",
+        semaphore: asyncio.Semaphore,
+        verse_key: str,
+        tafsir_id: int,
+    ) -> TafsirResult:
+        """
+        Async _fetch_single_tafsir over a shared aiohttp session.
+        
+        Args:
+            session: Session from api_client.create_async_session()
+            semaphore: Bounds in-flight requests to the current concurrency
+            verse_key: Verse key (e.g., "2:255")
+            tafsir_id: Tafsir resource ID
             
+        Returns:
+            TafsirResult with success/failure status
+        """
+        tafsir = self._cache_get(tafsir_id, verse_key)
+        if tafsir is not _MISSING:
+            return self._make_result(verse_key, tafsir_id, tafsir=tafsir, from_cache=True)
+        
+        async with semaphore:
+            try:
+                tafsir = await self.api_client.get_tafsir_by_ayah_async(
+                    session, tafsir_id, verse_key
+                )
+            except Exception as e:
+                return self._make_result(verse_key, tafsir_id, error=e)
+        self._cache_put(tafsir_id, verse_key, tafsir)
+        return self._make_result(verse_key, tafsir_id, tafsir=tafsir)
+    
+    def _chapter_groups(self, tasks: list[tuple[str, int]]) -> dict[tuple[int, int], list[str]]:
+        """Group uncached (verse_key, tafsir_id) tasks by (tafsir_id, chapter)."""
+        groups: dict[tuple[int, int], list[str]] = {}
+        for verse_key, tafsir_id in tasks:
+            position = _parse_verse_key(verse_key)
+            if position is not None and self._cache_get(tafsir_id, verse_key) is _MISSING:
+                groups.setdefault((tafsir_id, position[0]), []).append(verse_key)
+        return {
+            group: verse_keys
+            for group, verse_keys in groups.items()
+            if len(verse_keys) >= self.BULK_MIN_VERSES
+        }
+    
+    def _scatter_chapter(
+        self,
+        tafsir_id: int,
+        verse_keys: list[str],
+        tafsirs: dict[str, dict[str, Any]],
+        results: dict[str, dict[str, str | None]],
+    ) -> set[tuple[str, int]]:
+        """
+        Fill results from one by_chapter response.
+        
+        Returns:
+            (verse_key, tafsir_id) tasks that no longer need a per-ayah fetch
+        """
+        tafsir_name = self.tafsir_names.get(tafsir_id, f"Tafsir {tafsir_id}")
+        done: set[tuple[str, int]] = set()
+        
+        for verse_key in verse_keys:
+            tafsir = tafsirs.get(verse_key)
             if tafsir is None:
-                self.stats["not_found"] += 1
-                return TafsirResult(
-                    verse_key=verse_key,
-                    tafsir_id=tafsir_id,
-                    tafsir_name=tafsir_name,
-                    text=None,
-                    success=True,  # Not found is not an error
-                    error=None,
+                continue  # Partial data: left to the per-ayah fallback
+            self._cache_put(tafsir_id, verse_key, tafsir)
+            results[verse_key][tafsir_name] = tafsir.get("text", "")
+            self.stats["chapter_hits"] += 1
+            self.stats["successful"] += 1
+            done.add((verse_key, tafsir_id))
+        
+        return done
+    
+    def _fetch_chapter(self, tafsir_id: int, chapter: int) -> dict[str, dict[str, Any]]:
+        """get_tafsir_by_chapter that degrades to {} (per-ayah fallback) on error."""
+        self.stats["chapter_requests"] += 1
+        try:
+            return self.api_client.get_tafsir_by_chapter(tafsir_id, chapter)
+        except Exception as e:
+            self.stats["chapter_failures"] += 1
+            logger.warning(f"Failed to fetch tafsir {tafsir_id} for chapter {chapter}: {e}")
+            return {}
+    
+    async def _fetch_chapter_async(
+        self,
+        session: "aiohttp.ClientSession",
+        semaphore: asyncio.Semaphore,
+        tafsir_id: int,
+        chapter: int,
+    ) -> dict[str, dict[str, Any]]:
+        """Async _fetch_chapter."""
+        async with semaphore:
+            self.stats["chapter_requests"] += 1
+            try:
+                return await self.api_client.get_tafsir_by_chapter_async(
+                    session, tafsir_id, chapter
                 )
+            except Exception as e:
+                self.stats["chapter_failures"] += 1
+                logger.warning(f"Failed to fetch tafsir {tafsir_id} for chapter {chapter}: {e}")
+                return {}
+    
+    def _cache_get(self, tafsir_id: int, verse_key: str) -> Any:
+        """Return the memoized tafsir (possibly None) or _MISSING."""
+        key = (tafsir_id, verse_key)
+        if key in self._not_found:
+            return None
+        
+        with self._cache_lock:
+            tafsir = self._cache.get(key, _MISSING)
+            if tafsir is not _MISSING:
+                self._cache.move_to_end(key)
+                return tafsir
             
-            self.stats["successful"] += 1
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT text FROM tafsir_cache WHERE tafsir_id = ? AND verse_key = ?",
+                    key,
+                ).fetchone()
+                if row is not None and row[0] is None:
+                    # NULL text records a verse the tafsir does not cover
+                    self._not_found.add(key)
+                    tafsir = None
+                elif row is not None:
+                    tafsir = {"text": row[0]}
+                    self._memo(key, tafsir)
+        return tafsir
+    
+    def _cache_put(self, tafsir_id: int, verse_key: str, tafsir: dict[str, Any] | None) -> None:
+        """Memoize a fetched tafsir in memory and on disk."""
+        key = (tafsir_id, verse_key)
+        with self._cache_lock:
+            if tafsir is None:
+                self._not_found.add(key)
+            else:
+                self._not_found.discard(key)
+                self._memo(key, tafsir)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO tafsir_cache(tafsir_id, verse_key, text) "
+                    "VALUES (?, ?, ?)",
+                    (tafsir_id, verse_key, None if tafsir is None else tafsir.get("text", "")),
+                )
+    
+    def _memo(self, key: tuple[int, str], tafsir: dict[str, Any] | None) -> None:
+        """Insert into the LRU, evicting the least recently used entry (lock held)."""
+        self._cache[key] = tafsir
+        self._cache.move_to_end(key)
+        if len(self._cache) > self.CACHE_SIZE:
+            self._cache.popitem(last=False)
+    
+    def clear_cache(self) -> None:
+        """Drop memoized and persisted tafsirs (force the next fetch to hit the API)."""
+        with self._cache_lock:
+            self._cache.clear()
+            self._not_found.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM tafsir_cache")
+    
+    def _make_result(
+        self,
+        verse_key: str,
+        tafsir_id: int,
+        tafsir: dict[str, Any] | None = None,
+        error: Exception | None = None,
+        from_cache: bool = False,
+    ) -> TafsirResult:
+        """Build a TafsirResult and update statistics."""
+        tafsir_name = self.tafsir_names.get(tafsir_id, f"Tafsir {tafsir_id}")
+        if from_cache:
+            self.stats["cache_hits"] += 1
+        else:
+            self.stats["total_requests"] += 1
+        
+        if error is not None:
+            self.stats["failed"] += 1
+            logger.warning(f"Failed to fetch tafsir {tafsir_id} for {verse_key}: {error}")
             return TafsirResult(
                 verse_key=verse_key,
                 tafsir_id=tafsir_id,
                 tafsir_name=tafsir_name,
-                text=tafsir.get("text", ""),
-                success=True,
-                error=None,
+                text=None,
+                success=False,
+                error=str(error),
             )
-            
-        except Exception as e:
-            self.stats["failed"] += 1
-            logger.warning(f"Failed to fetch tafsir {tafsir_id} for {verse_key}: {e}")
+        
+        if tafsir is None:
+            self.stats["not_found"] += 1
             return TafsirResult(
                 verse_key=verse_key,
                 tafsir_id=tafsir_id,
                 tafsir_name=tafsir_name,
                 text=None,
-                success=False,
-                error=str(e),
+                success=True,  # Not found is not an error
+                error=None,
             )
-        finally:
-            self.stats["total_requests"] += 1
+        
+        self.stats["successful"] += 1
+        return TafsirResult(
+            verse_key=verse_key,
+            tafsir_id=tafsir_id,
+            tafsir_name=tafsir_name,
+            text=tafsir.get("text", ""),
+            success=True,
+            error=None,
+        )
     
     def fetch_for_verse(self, verse_key: str) -> dict[str, str | None]:
         """
@@ -195,11 +433,7 @@ class TafsirFetcher:
         results: dict[str, dict[str, str | None]] = {vk: {} for vk in verse_keys}
         
         # Create all tasks: (verse_key, tafsir_id) pairs
-        tasks = [
-            (verse_key, tafsir_id)
-            for verse_key in verse_keys
-            for tafsir_id in self.tafsir_ids
-        ]
+        tasks = self._build_tasks(verse_keys)
         
         if not tasks:
             return results
@@ -212,40 +446,281 @@ class TafsirFetcher:
             f"({len(tasks)} requests, concurrency={concurrency})"
         )
         
-        # Use ThreadPoolExecutor for parallel fetching
+        if aiohttp is not None and not self._in_event_loop():
+            return asyncio.run(
+                self._fetch_tasks_async(tasks, results, concurrency, position)
+            )
+        
+        # Fallback: ThreadPoolExecutor for parallel fetching
         with ThreadPoolExecutor(max_workers=concurrency) as executor:
-            # Submit all tasks
-            future_to_task = {
-                executor.submit(self._fetch_single_tafsir, vk, tid): (vk, tid)
-                for vk, tid in tasks
-            }
+            # One request per (tafsir, chapter); per-ayah only for what it missed
+            groups = self._chapter_groups(tasks)
+            done: set[tuple[str, int]] = set()
+            chapters = executor.map(lambda group: self._fetch_chapter(*group), groups)
+            for (tafsir_id, chapter), tafsirs in zip(groups, chapters):
+                done |= self._scatter_chapter(
+                    tafsir_id, groups[(tafsir_id, chapter)], tafsirs, results
+                )
+            tasks = [task for task in tasks if task not in done]
             
-            # Process completed tasks with progress bar
-            iterator = as_completed(future_to_task)
+            # Bounded submission window: at most 2x concurrency futures alive at once
+            pending: dict[Future, tuple[str, int]] = {}
+            progress = self._progress(len(tasks), position)
             
-            if self.show_progress:
-                iterator = tqdm(
-                    iterator,
-                    total=len(tasks),
-                    desc="Fetching tafsirs",
-                    position=position,
-                    leave=False,
-                    unit="tafsir",
-                )
+            def drain(return_when: str) -> None:
+                completed, _ = wait(pending, return_when=return_when)
+                for future in completed:
+                    verse_key, tafsir_id = pending.pop(future)
+                    
+                    try:
+                        tafsir_result = future.result()
+                        results[verse_key][tafsir_result.tafsir_name] = tafsir_result.text
+                    except Exception as e:
+                        logger.error(f"Unexpected error fetching {tafsir_id} for {verse_key}: {e}")
+                        tafsir_name = self.tafsir_names.get(tafsir_id, f"Tafsir {tafsir_id}")
+                        results[verse_key][tafsir_name] = None
+                    progress.update()
             
-            for future in iterator:
-                verse_key, tafsir_id = future_to_task[future]
+            with progress:
+                for vk, tid in tasks:
+                    if len(pending) >= 2 * concurrency:
+                        drain(FIRST_COMPLETED)
+                    pending[executor.submit(self._fetch_single_tafsir, vk, tid)] = (vk, tid)
                 
-                try:
-                    tafsir_result = future.result()
-                    results[verse_key][tafsir_result.tafsir_name] = tafsir_result.text
-                except Exception as e:
-                    logger.error(f"Unexpected error fetching {tafsir_id} for {verse_key}: {e}")
-                    tafsir_name = self.tafsir_names.get(tafsir_id, f"Tafsir {tafsir_id}")
-                    results[verse_key][tafsir_name] = None
+                if pending:
+                    drain(ALL_COMPLETED)
+        
+        return results
+    
+    def _build_tasks(self, verse_keys: list[str]) -> list[tuple[str, int]]:
+        """
+        Build (verse_key, tafsir_id) tasks, grouped by tafsir, in verse order.
+        
+        Requests for one tafsir and surah go out back to back, which keeps
+        the API's server-side caches warm over the keep-alive connections.
+        Duplicate verse keys are fetched once (results are keyed by verse).
+        Malformed keys go last and fail on their own per-ayah request.
+        """
+        positions = {vk: _parse_verse_key(vk) for vk in verse_keys}
+        malformed = [vk for vk, position in positions.items() if position is None]
+        if malformed:
+            logger.warning(f"Malformed verse keys (fetched last): {malformed[:5]}")
+        ordered = sorted(
+            positions,
+            key=lambda vk: (positions[vk] is None, positions[vk] or (0, 0)),
+        )
+        return [
+            (verse_key, tafsir_id)
+            for tafsir_id in self.tafsir_ids
+            for verse_key in ordered
+        ]
+    
+    @staticmethod
+    def _in_event_loop() -> bool:
+        """True when called from a running loop (asyncio.run would fail)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return False
+        return True
+    
+    async def fetch_for_verses_async(
+        self,
+        verse_keys: list[str],
+        position: int = 1,
+    ) -> dict[str, dict[str, str | None]]:
+        """
+        Async fetch_for_verses, for callers already inside an event loop.
+        
+        Args:
+            verse_keys: List of verse keys
+            position: Progress bar position (for nested bars)
+            
+        Returns:
+            Dictionary mapping verse_key to tafsir results
+        """
+        results: dict[str, dict[str, str | None]] = {vk: {} for vk in verse_keys}
+        tasks = self._build_tasks(verse_keys)
+        if not tasks:
+            return results
+        return await self._fetch_tasks_async(
+            tasks, results, self._get_current_concurrency(), position
+        )
+    
+    async def _fetch_tasks_async(
+        self,
+        tasks: list[tuple[str, int]],
+        results: dict[str, dict[str, str | None]],
+        concurrency: int,
+        position: int,
+    ) -> dict[str, dict[str, str | None]]:
+        """Run (verse_key, tafsir_id) tasks on one event loop and fill results."""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async with self.api_client.create_async_session(concurrency) as session:
+            with self._progress(len(tasks), position) as progress:
+                await self._run_tasks_async(
+                    session, semaphore, 2 * concurrency, tasks, results, progress
+                )
         
         return results
     
+    async def _run_tasks_async(
+        self,
+        session: "aiohttp.ClientSession",
+        semaphore: asyncio.Semaphore,
+        window: int,
+        tasks: list[tuple[str, int]],
+        results: dict[str, dict[str, str | None]],
+        progress: tqdm,
+    ) -> None:
+        """
+        Fetch tasks into results: by_chapter first, then per-ayah for the rest.
+        
+        Per-ayah requests run in a bounded window: at most `window` asyncio
+        Tasks exist at once, refilled as they finish, so memory stays
+        O(concurrency) rather than O(len(tasks)).
+        """
+        # One request per (tafsir, chapter); per-ayah only for what it missed
+        groups = self._chapter_groups(tasks)
+        chapters = await asyncio.gather(*(
+            self._fetch_chapter_async(session, semaphore, tafsir_id, chapter)
+            for tafsir_id, chapter in groups
+        ))
+        done: set[tuple[str, int]] = set()
+        for (tafsir_id, chapter), tafsirs in zip(groups, chapters):
+            done |= self._scatter_chapter(
+                tafsir_id, groups[(tafsir_id, chapter)], tafsirs, results
+            )
+        progress.update(len(done))
+        
+        pending: set[asyncio.Task] = set()
+        
+        def collect(completed: set[asyncio.Task]) -> None:
+            for task in completed:
+                tafsir_result = task.result()
+                results[tafsir_result.verse_key][tafsir_result.tafsir_name] = tafsir_result.text
+                progress.update()
+        
+        for vk, tid in tasks:
+            if (vk, tid) in done:
+                continue
+            if len(pending) >= window:
+                completed, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                collect(completed)
+            pending.add(asyncio.create_task(
+                self._fetch_single_tafsir_async(session, semaphore, vk, tid)
+            ))
+        
+        if pending:
+            completed, _ = await asyncio.wait(pending)
+            collect(completed)
+    
+    def _progress(self, total: int, position: int) -> tqdm:
+        """Progress bar for a fetch run (disabled when show_progress is off)."""
+        return tqdm(
+            total=total,
+            desc="Fetching tafsirs",
+            position=position,
+            leave=False,
+            unit="tafsir",
+            disable=not self.show_progress,
+            # Redraw at most every 0.5s / ~200 times per run, not per task
+            mininterval=0.5,
+            miniters=max(1, total // 200),
+        )
+    
+    def fetch_for_verses_streaming(
+        self,
+        verse_keys: list[str],
+        sink: Callable[[str, dict[str, str | None]], None],
+        position: int = 1,
+    ) -> None:
+        """
+        Fetch tafsirs for many chapters, handing each verse to `sink`.
+        
+        A chapter is flushed to `sink` and dropped as soon as its last task
+        completes, so only the chapters in flight are held in memory instead
+        of the full mapping fetch_for_verses builds (hundreds of MB for the
+        whole Quran with long-form tafsirs). Chapters share one event loop
+        and one aiohttp session and are fetched concurrently.
+        
+        Args:
+            verse_keys: List of verse keys
+            sink: Called as sink(verse_key, tafsirs) once per verse key.
+                Chapters arrive in completion order; verses within a chapter
+                in input order (e.g. to write JSONL lines)
+            position: Progress bar position (for nested bars)
+        """
+        # Malformed keys form their own group (None) and fail per-ayah
+        chapters: dict[int | None, list[str]] = {}
+        for verse_key in verse_keys:
+            position_in_quran = _parse_verse_key(verse_key)
+            chapter = position_in_quran[0] if position_in_quran else None
+            chapters.setdefault(chapter, []).append(verse_key)
+        
+        if not self.tafsir_ids:
+            for verse_key in verse_keys:
+                sink(verse_key, {})
+            return
+        
+        if aiohttp is not None and not self._in_event_loop():
+            asyncio.run(self._stream_chapters_async(
+                list(chapters.values()), sink, self._get_current_concurrency(), position
+            ))
+            return
+        
+        # Fallback: one thread-pool run per chapter
+        for chapter_keys in chapters.values():
+            results = self.fetch_for_verses(chapter_keys, position=position)
+            for verse_key in chapter_keys:
+                sink(verse_key, results[verse_key])
+    
+    async def _stream_chapters_async(
+        self,
+        chapters: list[list[str]],
+        sink: Callable[[str, dict[str, str | None]], None],
+        concurrency: int,
+        position: int,
+    ) -> None:
+        """Fetch chapters concurrently in one session, flushing each as it completes."""
+        semaphore = asyncio.Semaphore(concurrency)
+        total = sum(len(dict.fromkeys(keys)) for keys in chapters) * len(self.tafsir_ids)
+        
+        async def run_chapter(
+            chapter_keys: list[str],
+        ) -> tuple[list[str], dict[str, dict[str, str | None]]]:
+            results: dict[str, dict[str, str | None]] = {vk: {} for vk in chapter_keys}
+            await self._run_tasks_async(
+                session, semaphore, 2 * concurrency,
+                self._build_tasks(chapter_keys), results, progress,
+            )
+            return chapter_keys, results
+        
+        def flush(completed: set[asyncio.Task]) -> None:
+            for task in completed:
+                chapter_keys, results = task.result()
+                for verse_key in chapter_keys:
+                    sink(verse_key, results[verse_key])
+        
+        async with self.api_client.create_async_session(concurrency) as session:
+            with self._progress(total, position) as progress:
+                # At most `concurrency` chapters (and their results) in flight
+                pending: set[asyncio.Task] = set()
+                for chapter_keys in chapters:
+                    if len(pending) >= concurrency:
+                        completed, pending = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        flush(completed)
+                    pending.add(asyncio.create_task(run_chapter(chapter_keys)))
+                
+                if pending:
+                    completed, _ = await asyncio.wait(pending)
+                    flush(completed)
+    
     def fetch_for_verses_batch(
         self,
         verses: list[dict[str, Any]],
@@ -292,4 +767,8 @@ class TafsirFetcher:
             "successful": 0,
             "failed": 0,
             "not_found": 0,
+            "cache_hits": 0,
+            "chapter_requests": 0,
+            "chapter_failures": 0,
+            "chapter_hits": 0,
         }
@@ -0,0 +1,97 @@
+"""
+Tests for QuranAPIClient's Retry-After handling on 503 responses.
+
+Both request paths run against a local HTTP server that answers the first
+request with 503 and an hour-long Retry-After, then 200. The waits are
+recorded instead of slept, so a missing cap shows up as a failure, not a hang.
+
+Run: python -m unittest discover -s tests
+"""
+import asyncio
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from quran_api import QuranAPIClient, aiohttp
+
+RETRY_AFTER = "3600"
+CAP = 0.25
+
+
+class _RetryAfterHandler(BaseHTTPRequestHandler):
+    """503 + Retry-After on the first request, 200 with a JSON body afterwards."""
+    
+    requests_seen = 0
+    
+    def do_GET(self) -> None:
+        type(self).requests_seen += 1
+        if type(self).requests_seen == 1:
+            self.send_response(503)
+            self.send_header("Retry-After", RETRY_AFTER)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = json.dumps({"ok": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+class _ServerTestCase(unittest.TestCase):
+    def setUp(self) -> None:
+        _RetryAfterHandler.requests_seen = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RetryAfterHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        
+        host, port = self.server.server_address
+        self.client = QuranAPIClient(base_url=f"http://{host}:{port}", rate_limit_delay=0)
+        self.addCleanup(self.client.close)
+        
+        patcher = mock.patch.object(QuranAPIClient, "MAX_RETRY_AFTER", CAP)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class SyncRetryAfterTest(_ServerTestCase):
+    def test_retry_after_is_capped(self) -> None:
+        with mock.patch("urllib3.util.retry.time.sleep") as sleep:
+            result = self.client._request("/chapters")
+        
+        self.assertEqual(result, {"ok": True})
+        self.assertEqual(_RetryAfterHandler.requests_seen, 2)
+        sleep.assert_called_once_with(CAP)
+
+
+@unittest.skipIf(aiohttp is None, "aiohttp not installed")
+class AsyncRetryAfterTest(_ServerTestCase):
+    def test_retry_after_is_capped(self) -> None:
+        slept: list[float] = []
+        real_sleep = asyncio.sleep
+        
+        async def record_sleep(delay: float, *args, **kwargs):
+            slept.append(delay)
+            await real_sleep(0)
+        
+        async def fetch() -> dict:
+            async with self.client.create_async_session(concurrency=1) as session:
+                return await self.client._request_async(session, "/chapters")
+        
+        with mock.patch("quran_api.asyncio.sleep", record_sleep):
+            result = asyncio.run(fetch())
+        
+        self.assertEqual(result, {"ok": True})
+        self.assertEqual(_RetryAfterHandler.requests_seen, 2)
+        self.assertEqual(slept, [CAP])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,13 +17,24 @@ Author: Tazkiyah Project
 """
 
 import json
+import mmap
 import re
 import sys
-from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterator
 
 import click
+import numpy as np
+
+try:
+    import orjson
+except ImportError:  # optional: stdlib json is used instead
+    orjson = None
+
+# Both accept raw UTF-8 bytes, so files are read in binary mode
+_json_loads = orjson.loads if orjson is not None else json.loads
 
 # Expected verse counts for each surah
 SURAH_VERSE_COUNTS = {
@@ -43,6 +54,16 @@ SURAH_VERSE_COUNTS = {
 
 TOTAL_VERSES = sum(SURAH_VERSE_COUNTS.values())  # 6236
 
+# SURAH_VERSE_COUNTS as an array indexed by surah number ([0] unused)
+_EXPECTED_COUNTS = np.array([0, *SURAH_VERSE_COUNTS.values()], dtype=np.int16)
+
+# Arabic script blocks (base, supplement, extended-A, presentation forms A/B)
+_ARABIC_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
+
+# Packs a (surah, verse) pair into one int64 key: surah * stride + verse
+_PAIR_STRIDE = 1 << 20
+_INT64_MAX = np.iinfo(np.int64).max
+
 
 @click.command()
 @click.argument("input_file", type=click.Path(exists=True))
@@ -61,12 +82,19 @@ TOTAL_VERSES = sum(SURAH_VERSE_COUNTS.values())  # 6236
     is_flag=True,
     help="Strict mode: fail on any warning."
 )
+@click.option(
+    "--workers",
+    default=1,
+    type=click.IntRange(1, 32),
+    help="Processes for per-verse checks (default: 1, in-process)."
+)
 @click.help_option("--help", "-h")
 def main(
     input_file: str,
     output: str | None,
     verbose: bool,
     strict: bool,
+    workers: int,
 ) -> None:
     """
     Validate Quran data file for completeness and correctness.
@@ -91,7 +119,7 @@ def main(
     click.echo("")
     
     # Run validation
-    is_valid, report = validate_quran_data(str(input_path), verbose=verbose)
+    is_valid, report = validate_quran_data(str(input_path), verbose=verbose, workers=workers)
     
     # Display report
     click.echo(report)
@@ -118,6 +146,7 @@ def main(
 def validate_quran_data(
     file_path: str,
     verbose: bool = False,
+    workers: int = 1,
 ) -> tuple[bool, str]:
     """
     Validate Quran data file.
@@ -125,6 +154,9 @@ def validate_quran_data(
     Args:
         file_path: Path to JSONL or JSON file
         verbose: Include detailed output
+        workers: Processes for per-verse checks (1 = in-process). Pickling
+            verses to workers costs more than the checks for a single
+            Quran file, so this only pays off for much larger inputs.
         
     Returns:
         Tuple of (is_valid, report_string)
@@ -142,18 +174,17 @@ def validate_quran_data(
     
     try:
         if is_jsonl:
-            with open(path, "r", encoding="utf-8") as f:
-                for i, line in enumerate(f, 1):
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        verses.append(json.loads(line))
-                    except json.JSONDecodeError as e:
-                        errors.append(f"Line {i}: Invalid JSON - {e}")
+            for i, line in _iter_lines(path):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    verses.append(_json_loads(line))
+                except json.JSONDecodeError as e:  # orjson's error subclasses it
+                    errors.append(f"Line {i}: Invalid JSON - {e}")
         else:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            with open(path, "rb") as f:
+                data = _json_loads(f.read())
                 if isinstance(data, list):
                     verses = data
                 else:
@@ -166,80 +197,93 @@ def validate_quran_data(
     report_lines.append(f"Expected verses:     {TOTAL_VERSES}")
     report_lines.append("")
     
-    # Track verses by surah
-    verses_by_surah: dict[int, set[int]] = defaultdict(set)
-    translations_found: set[str] = set()
-    tafsirs_found: set[str] = set()
+    # Verse numbering as parallel arrays (0 = missing) for vectorized coverage checks
+    surah_nums, rejected_surahs = _read_numbers(verses, "surah_number")
+    verse_nums, rejected_verses = _read_numbers(verses, "verse_number")
+    numbered = (surah_nums != 0) & (verse_nums != 0)
+    in_range = (surah_nums >= 1) & (surah_nums <= 114)
+    valid_verse = (verse_nums >= 1) & (verse_nums < _PAIR_STRIDE)
     
-    # Required fields
+    # Distinct (surah, verse) pairs, so a duplicated verse is only counted once.
+    # Only valid pairs are packed: anything else would alias a neighbouring surah.
+    counted = numbered & in_range & valid_verse
+    pair_keys = np.unique(surah_nums[counted] * _PAIR_STRIDE + verse_nums[counted])
+    pair_surahs, pair_verses = np.divmod(pair_keys, _PAIR_STRIDE)
+    verse_counts = np.bincount(pair_surahs, minlength=115)
+    
+    # Required fields (only re-checked per verse when some verse lacks one)
     required_fields = ["verse_id", "surah_number", "verse_number", "arabic_text"]
+    missing_fields = [
+        field for field in required_fields
+        if any(field not in verse for verse in verses)
+    ]
     
-    # Validate each verse
-    for i, verse in enumerate(verses):
-        verse_id = verse.get("verse_id", f"verse_{i}")
-        
-        # Check required fields
-        for field in required_fields:
-            if field not in verse:
-                errors.append(f"{verse_id}: Missing required field '{field}'")
-        
-        # Parse verse_id
-        surah_num = verse.get("surah_number")
-        verse_num = verse.get("verse_number")
-        
-        if surah_num and verse_num:
-            verses_by_surah[surah_num].add(verse_num)
-        
-        # Check Arabic text
-        arabic = verse.get("arabic_text", "")
-        if not arabic:
-            warnings.append(f"{verse_id}: Empty Arabic text")
-        elif not has_arabic_chars(arabic):
-            warnings.append(f"{verse_id}: Arabic text has no Arabic characters")
-        
-        # Track translations
-        translations = verse.get("translations", {})
-        translations_found.update(translations.keys())
-        
-        # Track tafsirs
-        tafsirs = verse.get("tafsirs", {})
-        tafsirs_found.update(tafsirs.keys())
+    # Validate each verse (in ordered chunks, so messages keep file order)
+    if workers > 1 and len(verses) > 1:
+        chunk_size = -(-len(verses) // (workers * 4))
+        starts = range(0, len(verses), chunk_size)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            partials = list(executor.map(
+                _validate_chunk,
+                starts,
+                (verses[start:start + chunk_size] for start in starts),
+                repeat(missing_fields),
+            ))
+    else:
+        partials = [_validate_chunk(0, verses, missing_fields)]
+    
+    translations_found: set[str] = set()
+    tafsirs_found: set[str] = set()
+    for chunk_errors, chunk_warnings, chunk_translations, chunk_tafsirs in partials:
+        errors.extend(chunk_errors)
+        warnings.extend(chunk_warnings)
+        translations_found |= chunk_translations
+        tafsirs_found |= chunk_tafsirs
     
     # Check verse coverage
     report_lines.append("SURAH COVERAGE:")
     report_lines.append("-" * 40)
     
-    missing_surahs = []
-    incomplete_surahs = []
-    extra_surahs = []
+    # Compare all 114 surahs against their expected counts at once
+    actual_counts = verse_counts[1:]
+    expected_counts = _EXPECTED_COUNTS[1:]
+    missing_count = int(np.count_nonzero(actual_counts == 0))
+    incomplete_count = int(np.count_nonzero((actual_counts > 0) & (actual_counts < expected_counts)))
     
-    for surah_num in range(1, 115):
-        expected = SURAH_VERSE_COUNTS[surah_num]
-        actual = len(verses_by_surah.get(surah_num, set()))
+    for surah_num in np.flatnonzero(actual_counts != expected_counts) + 1:
+        expected = int(_EXPECTED_COUNTS[surah_num])
+        actual = int(verse_counts[surah_num])
         
         if actual == 0:
-            missing_surahs.append(surah_num)
             errors.append(f"Surah {surah_num}: Missing (0/{expected} verses)")
         elif actual < expected:
-            incomplete_surahs.append((surah_num, actual, expected))
             # Find missing verses
-            found = verses_by_surah[surah_num]
-            missing = [v for v in range(1, expected + 1) if v not in found]
+            missing = np.setdiff1d(
+                np.arange(1, expected + 1), pair_verses[pair_surahs == surah_num]
+            ).tolist()
             errors.append(f"Surah {surah_num}: Incomplete ({actual}/{expected} verses). Missing: {missing[:5]}{'...' if len(missing) > 5 else ''}")
-        elif actual > expected:
-            extra_surahs.append((surah_num, actual, expected))
+        else:
             warnings.append(f"Surah {surah_num}: Extra verses ({actual}/{expected})")
-        elif verbose:
-            report_lines.append(f"  Surah {surah_num:3d}: ✓ {actual}/{expected}")
     
-    # Find surahs not in expected range
-    for surah_num in verses_by_surah:
-        if surah_num < 1 or surah_num > 114:
-            warnings.append(f"Invalid surah number: {surah_num}")
+    if verbose:
+        for surah_num in np.flatnonzero(actual_counts == expected_counts) + 1:
+            report_lines.append(f"  Surah {surah_num:3d}: ✓ {verse_counts[surah_num]}/{_EXPECTED_COUNTS[surah_num]}")
+    
+    # Find surahs not in expected range, and verse numbers that can't be counted
+    for surah_num in np.unique(surah_nums[numbered & ~in_range]):
+        warnings.append(f"Invalid surah number: {surah_num}")
+    warnings.extend(rejected_surahs)
     
-    report_lines.append(f"\n  Complete:   {114 - len(missing_surahs) - len(incomplete_surahs)} / 114 surahs")
-    report_lines.append(f"  Missing:    {len(missing_surahs)}")
-    report_lines.append(f"  Incomplete: {len(incomplete_surahs)}")
+    bad_verses = np.unique(
+        np.column_stack((surah_nums, verse_nums))[numbered & in_range & ~valid_verse], axis=0
+    )
+    for surah_num, verse_num in bad_verses:
+        warnings.append(f"Invalid verse number: {surah_num}:{verse_num}")
+    warnings.extend(rejected_verses)
+    
+    report_lines.append(f"\n  Complete:   {114 - missing_count - incomplete_count} / 114 surahs")
+    report_lines.append(f"  Missing:    {missing_count}")
+    report_lines.append(f"  Incomplete: {incomplete_count}")
     
     # Translation coverage
     report_lines.append("\nTRANSLATIONS:")
@@ -287,10 +331,105 @@ def validate_quran_data(
     return is_valid, report
 
 
+def _read_numbers(verses: list[dict[str, Any]], field: str) -> tuple[np.ndarray, list[str]]:
+    """
+    Read an integer verse field into an int64 array (0 = missing).
+    
+    Returns:
+        Tuple of (array, messages for rejected values). Values that are not
+        plain ints (floats, strings, bools) or are too large for int64 are
+        stored as 0 in the array and reported per record instead.
+    """
+    rejected: list[str] = []
+    
+    def values() -> Iterator[int]:
+        for i, verse in enumerate(verses):
+            value = verse.get(field) or 0
+            if isinstance(value, int) and not isinstance(value, bool) and (
+                -_INT64_MAX <= value <= _INT64_MAX
+            ):
+                yield value
+            else:
+                verse_id = verse.get("verse_id", f"verse_{i}")
+                rejected.append(f"{verse_id}: Invalid {field.replace('_', ' ')}: {value!r}")
+                yield 0
+    
+    return np.fromiter(values(), dtype=np.int64, count=len(verses)), rejected
+
+
+def _iter_lines(path: Path) -> Iterator[tuple[int, bytes]]:
+    """
+    Yield (line_number, line) from a memory-mapped file.
+    
+    mmap.readline scans for the newline in C straight over the page cache,
+    skipping the per-line buffering of a file iterator.
+    """
+    with open(path, "rb") as f:
+        if f.seek(0, 2) == 0:
+            return  # mmap cannot map an empty file
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield from enumerate(iter(mm.readline, b""), 1)
+
+
+def _validate_chunk(
+    start: int,
+    verses: list[dict[str, Any]],
+    missing_fields: list[str],
+) -> tuple[list[str], list[str], set[str], set[str]]:
+    """
+    Run the per-verse checks over a slice of verses.
+    
+    Args:
+        start: Index of the first verse in the full list (for unnamed verses)
+        verses: Slice of verses to check
+        missing_fields: Required fields that some verse lacks
+        
+    Returns:
+        Tuple of (errors, warnings, translations_found, tafsirs_found)
+    """
+    errors: list[str] = []
+    warnings: list[str] = []
+    translations_found: set[str] = set()
+    tafsirs_found: set[str] = set()
+    
+    for i, verse in enumerate(verses, start):
+        verse_id = verse.get("verse_id", f"verse_{i}")
+        
+        # Check required fields
+        for field in missing_fields:
+            if field not in verse:
+                errors.append(f"{verse_id}: Missing required field '{field}'")
+        
+        # Check Arabic text
+        arabic = verse.get("arabic_text", "")
+        if not arabic:
+            warnings.append(f"{verse_id}: Empty Arabic text")
+        elif not has_arabic_chars(arabic):
+            warnings.append(f"{verse_id}: Arabic text has no Arabic characters")
+        
+        # Track translations
+        translations = verse.get("translations", {})
+        translations_found.update(translations.keys())
+        
+        # Track tafsirs
+        tafsirs = verse.get("tafsirs", {})
+        tafsirs_found.update(tafsirs.keys())
+    
+    return errors, warnings, translations_found, tafsirs_found
+
+
 def has_arabic_chars(text: str) -> bool:
     """Check if text contains Arabic characters."""
-    arabic_pattern = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]")
-    return bool(arabic_pattern.search(text))
+    # Verses start with an Arabic letter: check the first character before scanning
+    first = text.lstrip()[:1]
+    if first:
+        c = ord(first)
+        if (
+            0x0600 <= c <= 0x06FF or 0x0750 <= c <= 0x077F or 0x08A0 <= c <= 0x08FF
+            or 0xFB50 <= c <= 0xFDFF or 0xFE70 <= c <= 0xFEFF
+        ):
+            return True
+    return _ARABIC_RE.search(text) is not None
 
 
 if __name__ == "__main__":